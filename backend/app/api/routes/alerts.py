@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Query
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional
 from app.services.alerts.india_monitor import get_comprehensive_india_alerts
 
@@ -9,7 +10,8 @@ async def full_report(
     month: Optional[str] = Query(None),
     category: Optional[str] = Query(None)
 ):
-    data = get_comprehensive_india_alerts(target_month=month)
+    # Upstream HTTP calls blocking hain, event loop ko free rakho
+    data = await run_in_threadpool(get_comprehensive_india_alerts, target_month=month)
     
     # Soft Filter: Agar category mangi hai toh title ya category mein dhundo
     if category:
@@ -1,20 +1,44 @@
-from fastapi import APIRouter, UploadFile, File, Form
-from fastapi.responses import FileResponse
-import shutil, os
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, Response
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from uuid import uuid4
+import os, shutil
+from app.core.config import settings
+from app.core.metrics import current_timings
 from app.services.analysis.processor import run_deep_analysis
+from app.services.analysis.heatmap_tiles import map_info, overview_path, render_tile
 from app.services.analysis.reporter import create_pdf_report
-from app.services.relief.aid_calculator import calculate_relief_needs
-from app.services.relief.relief_reporter import create_relief_pdf
+from app.services.analysis.report_store import load_report, store_report
+from app.services.relief.aid_calculator import MAX_POPULATION, calculate_relief_needs, plan_relief_batch
+from app.services.relief.relief_reporter import create_relief_pdf, create_relief_pdf_batch
+from app.services.satellite.imagery_cache import get_tile_cache
+from app.services.integrity.duplicate_detector import compute_sha256
+from app.services.ledger import verification_ledger as ledger
+from datetime import date
 
 router = APIRouter()
 
+# PDFs report_store mein per-request id ke saath; har report_link sirf apni report kholta hai
+def _pdf_response(kind: str, report_id: str, download_name: str):
+    pdf = load_report(kind, report_id)
+    if pdf is None:
+        raise HTTPException(status_code=404, detail="Report not found or expired.")
+    return Response(
+        content=pdf,
+        media_type="application/pdf",
+        headers={"Content-Disposition": f'attachment; filename="{download_name}"'},
+    )
+
 @router.post("/deep-damage-assessment")
 async def analyze_damage(
     before_img: UploadFile = File(...), 
     after_img: UploadFile = File(...)
 ):
-    # 1. Temporary save images to disk
-    b_path, a_path = "temp_before.png", "temp_after.png"
+    # 1. Temporary save images to disk (unique names, parallel requests ke liye)
+    tag = uuid4().hex
+    b_path, a_path = f"temp_before_{tag}.png", f"temp_after_{tag}.png"
     
     with open(b_path, "wb") as b:
         shutil.copyfileobj(before_img.file, b)
@@ -24,48 +48,162 @@ async def analyze_damage(
 
     # 2. Run Image-to-Image Analysis (OpenCV Logic)
     try:
-        results = run_deep_analysis(b_path, a_path)
+        results = await run_in_threadpool(run_deep_analysis, b_path, a_path)
+        before_sha = await run_in_threadpool(compute_sha256, b_path)
+        after_sha = await run_in_threadpool(compute_sha256, a_path)
         
-        # 3. Create PDF Report
-        create_pdf_report(results)
+        # 3. Create PDF Report (in-memory)
+        pdf = await run_in_threadpool(create_pdf_report, results)
+        report_id = await run_in_threadpool(store_report, "damage", pdf)
+
+        ledger.record(
+            "damage_assessment", sha256=after_sha, verdict=results["severity"],
+            timings=current_timings(), result={"before_sha256": before_sha, "results": results},
+        )
+
+        return {
+            "status": "success",
+            "results": results,
+            "report_link": f"http://127.0.0.1:8000/analysis/download-report/{report_id}"
+        }
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+    finally:
+        for path in (b_path, a_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+def _iso_date(value: str) -> str:
+    try:
+        return date.fromisoformat(value.strip()).isoformat()
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid date '{value}', expected YYYY-MM-DD.")
 
+def _satellite_assessment(lat, lon, before, after, zoom):
+    before_chip, after_chip, imagery = get_tile_cache().get_pair(lat, lon, before, after, zoom=zoom)
+    results = run_deep_analysis(before_chip, after_chip)
+    return results, imagery
+
+@router.post("/satellite-damage-assessment")
+async def analyze_damage_from_satellite(
+    lat: float = Form(...),
+    lon: float = Form(...),
+    before_start: str = Form(...),
+    before_end: str = Form(...),
+    after_start: str = Form(...),
+    after_end: str = Form(...),
+    zoom: Optional[int] = Form(None, ge=0, le=20)
+):
+    # Upload ki zaroorat nahi: before/after Sentinel-2 chips tile cache se aate hain
+    before = (_iso_date(before_start), _iso_date(before_end))
+    after = (_iso_date(after_start), _iso_date(after_end))
+    try:
+        results, imagery = await run_in_threadpool(_satellite_assessment, lat, lon, before, after, zoom)
+        pdf = await run_in_threadpool(create_pdf_report, results)
+        report_id = await run_in_threadpool(store_report, "damage", pdf)
+        ledger.record(
+            "satellite_assessment", lat=lat, lon=lon, verdict=results["severity"],
+            timings=current_timings(), result={"imagery": imagery, "results": results},
+        )
         return {
             "status": "success",
             "results": results,
-            "report_link": "http://127.0.0.1:8000/analysis/download-report"
+            "imagery": imagery,
+            "report_link": f"http://127.0.0.1:8000/analysis/download-report/{report_id}"
         }
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
-@router.get("/download-report")
-async def download_report():
-    report_path = "Damage_Report.pdf"
-    if os.path.exists(report_path):
-        return FileResponse(report_path, media_type="application/pdf", filename="Impact_Report.pdf")
-    return {"error": "Report file not found."}
+# Heatmap routes plain def hain: disk/mmap aur PNG encode threadpool mein chalte hain
+@router.get("/heatmap/{map_id}/meta")
+def heatmap_meta(map_id: str):
+    try:
+        return map_info(map_id)
+    except (ValueError, FileNotFoundError):
+        raise HTTPException(status_code=404, detail="Heatmap not found.")
+
+@router.get("/heatmap/{map_id}/overview.png")
+def heatmap_overview(map_id: str):
+    try:
+        path = overview_path(map_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Heatmap not found.")
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Heatmap not found.")
+    return FileResponse(path, media_type="image/png")
+
+@router.get("/heatmap/{map_id}/{z}/{x}/{y}.png")
+def heatmap_tile(map_id: str, z: int, x: int, y: int):
+    try:
+        tile = render_tile(map_id, z, x, y)
+    except (ValueError, FileNotFoundError):
+        raise HTTPException(status_code=404, detail="Heatmap not found.")
+    if tile is None:
+        raise HTTPException(status_code=404, detail="Tile out of range.")
+    # Diff map immutable hai, browser tile ko hamesha cache kar sakta hai
+    return Response(content=tile, media_type="image/png",
+                    headers={"Cache-Control": "public, max-age=31536000, immutable"})
+
+@router.get("/download-report/{report_id}")
+def download_report(report_id: str):
+    return _pdf_response("damage", report_id, "Impact_Report.pdf")
 
 
 @router.post("/relief-translator")
 async def get_relief_aid(
     disaster_type: str = Form(...), 
     location_context: str = Form(...), 
-    population_count: int = Form(...)
+    population_count: int = Form(..., ge=0, le=MAX_POPULATION)
 ):
     # 1. Logic call
     relief_data = calculate_relief_needs(disaster_type, location_context, population_count)
     
-    # 2. PDF Report create
-    create_relief_pdf(relief_data)
+    # 2. PDF Report create (in-memory)
+    report_id = store_report("relief", create_relief_pdf(relief_data))
     
     return {
         "status": "success",
         "data": relief_data,
-        "report_link": "http://127.0.0.1:8000/analysis/download-relief-report"
+        "report_link": f"http://127.0.0.1:8000/analysis/download-relief-report/{report_id}"
+    }
+
+@router.get("/download-relief-report/{report_id}")
+def download_relief(report_id: str):
+    return _pdf_response("relief", report_id, "Relief_Blueprint.pdf")
+
+class ReliefLocation(BaseModel):
+    district: Optional[str] = None
+    disaster_type: str
+    location_context: str
+    population_count: int = Field(..., ge=0, le=MAX_POPULATION)
+
+class ReliefBatchRequest(BaseModel):
+    locations: List[ReliefLocation] = Field(..., max_length=settings.RELIEF_BATCH_MAX_LOCATIONS)
+    include_report: bool = False
+
+def _relief_batch(locations, include_report):
+    batch = plan_relief_batch(locations, include_plans=include_report)
+    report_id = None
+    if include_report:
+        # Saare districts ek hi PDF mein, ek pass mein
+        report_id = store_report("relief_batch", create_relief_pdf_batch(batch["plans"]))
+    return batch, report_id
+
+@router.post("/relief-batch")
+async def get_relief_batch(payload: ReliefBatchRequest):
+    locations = [loc.model_dump() for loc in payload.locations]
+    # Matrix + multi-page PDF CPU-bound hain, event loop block na ho
+    batch, report_id = await run_in_threadpool(_relief_batch, locations, payload.include_report)
+
+    response = {
+        "status": "success",
+        "per_district": batch["per_district"],
+        "aggregate": batch["aggregate"],
     }
+    if report_id is not None:
+        response["report_link"] = f"http://127.0.0.1:8000/analysis/download-relief-batch-report/{report_id}"
+    return response
 
-@router.get("/download-relief-report")
-async def download_relief():
-    report_path = "Relief_Plan.pdf"
-    if os.path.exists(report_path):
-        return FileResponse(report_path, media_type="application/pdf", filename="Relief_Blueprint.pdf")
-    return {"error": "Report file not found."}
\ No newline at end of file
+@router.get("/download-relief-batch-report/{report_id}")
+def download_relief_batch(report_id: str):
+    return _pdf_response("relief_batch", report_id, "Relief_Blueprint_Batch.pdf")
@@ -1,12 +1,18 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi import APIRouter, UploadFile, File, Form, Header, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional
+from uuid import uuid4
 import os
 
 # Services import
 from app.services.integrity.tamper_detector import detect_tampering
+from app.services.integrity.duplicate_detector import compute_hash, compute_sha256
+from app.services.ledger import verification_ledger as ledger
 from app.services.satellite.sentinel_client import check_satellite_area
 from app.services.vision_ai.reverse_search import get_image_history
 from app.services.vision_ai.authenticity_engine import analyze_authenticity
+from app.core.metrics import timed, current_timings
+from app.core.admission import is_responder_key
 
 router = APIRouter()
 
@@ -16,7 +22,8 @@ async def verify_media(
     lat: Optional[str] = Form(None),
     lon: Optional[str] = Form(None)
 ):
-    current_file_path = f"temp_{file.filename}"
+    # Unique temp name: same filename wale parallel uploads ek doosre ko overwrite na karein
+    current_file_path = f"temp_{uuid4().hex}{os.path.splitext(file.filename or '')[1]}"
     
     # Debugging prints to track coordinate flow
     print(f"\n--- Processing New Request ---")
@@ -29,25 +36,15 @@ async def verify_media(
         safe_lon = float(lon) if lon and lon.strip() else None
 
         # 1. Save Image Locally
-        contents = await file.read()
-        with open(current_file_path, "wb") as f:
-            f.write(contents)
+        with timed("media.upload"):
+            contents = await file.read()
+            with open(current_file_path, "wb") as f:
+                f.write(contents)
 
-        # 2. AI Content Check (Origin)
-        ai_check = analyze_authenticity(current_file_path)
-
-        # 3. Tampering Check (Integrity)
-        tamper = detect_tampering(current_file_path)
-
-        # 4. Satellite Ground Truth Check (Context)
-        satellite = {"status": "skipped"}
-        if safe_lat is not None and safe_lon is not None:
-            print(f"Cross-referencing with Satellite at: {safe_lat}, {safe_lon}")
-            satellite = check_satellite_area(safe_lat, safe_lon)
-            print(f"Satellite Match Result: {satellite.get('status')}")
-
-        # 5. Reverse Search Check
-        history = get_image_history(current_file_path)
+        # 2-5. CPU/network heavy checks threadpool mein, taaki event loop baaki requests serve kare
+        ai_check, tamper, satellite, history, hashes = await run_in_threadpool(
+            run_checks, current_file_path, safe_lat, safe_lon
+        )
 
         # 6. Compute Cross-Matched Verdict
         verdict = compute_cross_matched_verdict(ai_check, tamper, satellite, history)
@@ -56,7 +53,7 @@ async def verify_media(
         if os.path.exists(current_file_path):
             os.remove(current_file_path)
 
-        return {
+        response = {
             "status": "success",
             "verdict": verdict,
             "details": {
@@ -67,12 +64,67 @@ async def verify_media(
             }
         }
 
+        # 7. Audit ledger (write-behind, request ko wait nahi karna padta)
+        ledger.record(
+            "verify", sha256=hashes["sha256"], phash=hashes["phash"],
+            lat=safe_lat, lon=safe_lon, verdict=verdict["label"],
+            timings=current_timings(), result=response,
+        )
+        return response
+
     except Exception as e:
         if os.path.exists(current_file_path):
             os.remove(current_file_path)
         print(f"Error: {str(e)}")
         return {"status": "error", "message": str(e)}
 
+def run_checks(file_path, lat, lon):
+    # 2. AI Content Check (Origin)
+    ai_check = analyze_authenticity(file_path)
+
+    # 3. Tampering Check (Integrity)
+    tamper = detect_tampering(file_path)
+
+    # 4. Satellite Ground Truth Check (Context)
+    satellite = {"status": "skipped"}
+    if lat is not None and lon is not None:
+        print(f"Cross-referencing with Satellite at: {lat}, {lon}")
+        satellite = check_satellite_area(lat, lon)
+        print(f"Satellite Match Result: {satellite.get('status')}")
+
+    # 5. Reverse Search Check
+    history = get_image_history(file_path)
+
+    # Ledger ke liye exact aur perceptual hash
+    hashes = {"sha256": compute_sha256(file_path), "phash": compute_hash(file_path)}
+
+    return ai_check, tamper, satellite, history, hashes
+
+@router.get("/ledger")
+async def query_ledger(
+    sha256: Optional[str] = Query(None),
+    phash: Optional[str] = Query(None),
+    since: Optional[float] = Query(None, description="Unix timestamp"),
+    until: Optional[float] = Query(None, description="Unix timestamp"),
+    min_lat: Optional[float] = Query(None),
+    max_lat: Optional[float] = Query(None),
+    min_lon: Optional[float] = Query(None),
+    max_lon: Optional[float] = Query(None),
+    limit: int = Query(100, ge=1, le=1000),
+    x_responder_key: Optional[str] = Header(None)
+):
+    # Ledger mein coordinates aur results hain: sirf responders ke liye
+    if not is_responder_key(x_responder_key):
+        raise HTTPException(status_code=403, detail="Responder key required.")
+    store = ledger.get_ledger()
+    if store is None:
+        raise HTTPException(status_code=503, detail="Verification ledger is disabled.")
+    rows = await run_in_threadpool(
+        store.query, sha256=sha256, phash=phash, since=since, until=until,
+        min_lat=min_lat, max_lat=max_lat, min_lon=min_lon, max_lon=max_lon, limit=limit,
+    )
+    return {"status": "success", "total": len(rows), "entries": rows}
+
 def compute_cross_matched_verdict(ai_check, tamper, satellite, history):
     ai_label = ai_check.get("label")
     ai_conf = ai_check.get("confidence", 0)
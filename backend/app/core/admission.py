@@ -0,0 +1,177 @@
+import asyncio
+import heapq
+import hmac
+import itertools
+import math
+from time import perf_counter
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+
+from app.core.config import settings
+from app.core.metrics import describe, inc, observe, set_gauge
+
+# Admission control for expensive endpoints: a fixed number of requests run
+# at once, a bounded priority queue waits behind them, everything else is
+# turned away immediately with 503 + Retry-After. Slot request body padhne se
+# pehle (ASGI middleware mein) liya jata hai, taaki reject hone wala upload
+# kabhi receive hi na ho.
+
+PRIORITY_RESPONDER = 0
+PRIORITY_PUBLIC = 1
+PRIORITY_NAMES = {PRIORITY_RESPONDER: "responder", PRIORITY_PUBLIC: "public"}
+
+IN_FLIGHT_METRIC = "pratyaksh_admission_in_flight"
+QUEUED_METRIC = "pratyaksh_admission_queued"
+REJECTED_METRIC = "pratyaksh_admission_rejected_total"
+WAIT_METRIC = "pratyaksh_admission_wait_seconds"
+
+describe(IN_FLIGHT_METRIC, "Requests currently holding an admission slot.")
+describe(QUEUED_METRIC, "Requests waiting for an admission slot.")
+describe(REJECTED_METRIC, "Requests rejected by admission control.")
+describe(WAIT_METRIC, "Time spent queued before admission.")
+
+
+class AdmissionController:
+    def __init__(self, name, max_concurrency, max_queue, max_wait):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.active = 0
+        self.queued = 0
+        self._waiters = []  # heap of (priority, seq, future)
+        self._seq = itertools.count()
+        # Average slot hold time, Retry-After estimate ke liye
+        self._avg_service = 1.0
+        self._publish()
+
+    def _publish(self):
+        set_gauge(IN_FLIGHT_METRIC, self.active, endpoint=self.name)
+        set_gauge(QUEUED_METRIC, self.queued, endpoint=self.name)
+
+    def retry_after(self):
+        waves = (self.queued + 1) / float(self.max_concurrency)
+        return max(1, math.ceil(waves * self._avg_service))
+
+    def _reject(self, reason):
+        inc(REJECTED_METRIC, endpoint=self.name, reason=reason)
+        raise HTTPException(
+            status_code=503,
+            detail=f"Server busy ({reason}), please retry shortly.",
+            headers={"Retry-After": str(self.retry_after())},
+        )
+
+    async def acquire(self, priority=PRIORITY_PUBLIC):
+        start = perf_counter()
+        if self.active < self.max_concurrency and not self.queued:
+            self.active += 1
+            self._publish()
+            return start
+
+        if self.queued >= self.max_queue:
+            self._reject("queue_full")
+
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), fut))
+        self.queued += 1
+        self._publish()
+        try:
+            await asyncio.wait_for(fut, timeout=self.max_wait)
+        except BaseException as e:
+            if fut.done() and not fut.cancelled():
+                # Slot mil chuka tha par client chala gaya: aage de do
+                # (queue time service time nahi hai, isliye timestamp nahi)
+                self.release()
+            else:
+                fut.cancel()
+                self.queued -= 1
+                self._publish()
+            if isinstance(e, asyncio.TimeoutError):
+                self._reject("timeout")
+            raise
+
+        observe(WAIT_METRIC, perf_counter() - start, endpoint=self.name,
+                priority=PRIORITY_NAMES.get(priority, str(priority)))
+        return start
+
+    def release(self, admitted_at=None):
+        if admitted_at is not None:
+            held = perf_counter() - admitted_at
+            self._avg_service = 0.8 * self._avg_service + 0.2 * held
+
+        # Slot seedha agle (highest priority) waiter ko handover, active count same rehta hai
+        while self._waiters:
+            _, _, fut = heapq.heappop(self._waiters)
+            if not fut.done():
+                self.queued -= 1
+                fut.set_result(None)
+                self._publish()
+                return
+        self.active -= 1
+        self._publish()
+
+
+def is_responder_key(key) -> bool:
+    expected = settings.RESPONDER_API_KEY
+    if not expected or not key:
+        return False
+    return hmac.compare_digest(key.encode(), expected.encode())
+
+
+def request_priority(headers) -> int:
+    if is_responder_key(headers.get("x-responder-key")):
+        return PRIORITY_RESPONDER
+    return PRIORITY_PUBLIC
+
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware that holds an admission slot for gated POST routes.
+
+    `routes` maps a request path to its AdmissionController. The slot is
+    acquired before the app (and so the body parser) ever calls `receive`,
+    and released once the response has been sent.
+    """
+
+    def __init__(self, app, routes):
+        self.app = app
+        self.routes = routes
+
+    async def __call__(self, scope, receive, send):
+        controller = None
+        if scope["type"] == "http" and scope["method"] == "POST":
+            controller = self.routes.get(scope["path"])
+        if controller is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Gated paths static hain, metrics label ke liye safe (shed requests ko route nahi milta)
+        scope["admission_route"] = scope["path"]
+
+        try:
+            admitted_at = await controller.acquire(request_priority(Headers(scope=scope)))
+        except HTTPException as e:
+            response = JSONResponse({"detail": e.detail}, status_code=e.status_code, headers=e.headers)
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release(admitted_at)
+
+
+verify_gate = AdmissionController(
+    "media_verify",
+    max_concurrency=settings.VERIFY_MAX_CONCURRENCY,
+    max_queue=settings.VERIFY_MAX_QUEUE,
+    max_wait=settings.ADMISSION_MAX_WAIT,
+)
+
+analysis_gate = AdmissionController(
+    "damage_assessment",
+    max_concurrency=settings.ANALYSIS_MAX_CONCURRENCY,
+    max_queue=settings.ANALYSIS_MAX_QUEUE,
+    max_wait=settings.ADMISSION_MAX_WAIT,
+)
@@ -11,6 +11,38 @@ class Settings(BaseSettings):
     ALLOWED_ORIGINS: str = "*"
     UPLOAD_DIR: str = "./uploads"
     MAX_UPLOAD_SIZE: int = 104857600  # 100MB
+    SERVER_TIMING: bool = False  # per-request Server-Timing header
+
+    # Admission control (expensive endpoints)
+    VERIFY_MAX_CONCURRENCY: int = 2
+    VERIFY_MAX_QUEUE: int = 16
+    ANALYSIS_MAX_CONCURRENCY: int = 1
+    ANALYSIS_MAX_QUEUE: int = 4
+    ADMISSION_MAX_WAIT: float = 20.0  # seconds in queue before 503
+    RESPONDER_API_KEY: str = ""  # X-Responder-Key for official responders (priority lane)
+    RELIEF_BATCH_MAX_LOCATIONS: int = 1000
+
+    # Sentinel-2 imagery tile cache
+    IMAGERY_SOURCE: str = "earthengine"  # or "local" (fixture directory)
+    IMAGERY_FIXTURE_DIR: str = "./imagery_fixtures"
+    IMAGERY_CACHE_DIR: str = "./imagery_cache"
+    IMAGERY_TILE_ZOOM: int = 15
+    IMAGERY_CHIP_SIZE: int = 256
+
+    # Damage heatmap store (served via /analysis/heatmap, not static/)
+    HEATMAP_DIR: str = "./heatmap_store"
+    HEATMAP_MAX_MAPS: int = 200
+    HEATMAP_MAX_AGE: float = 604800.0  # seconds since last use (7 days)
+
+    # Rendered PDF reports (download links valid for REPORT_TTL)
+    REPORT_DIR: str = "./report_store"
+    REPORT_TTL: float = 3600.0  # seconds
+    REPORT_STORE_MAX_BYTES: int = 536870912  # 512MB
+
+    # Verification ledger (write-behind into DATABASE_URL)
+    LEDGER_BATCH_SIZE: int = 200
+    LEDGER_FLUSH_INTERVAL: float = 0.5  # seconds
+    LEDGER_MAX_QUEUE: int = 10000
 
     # # Satellite / APIs (free-only stack)
     # SENTINEL_CLIENT_ID: str | None = None
@@ -0,0 +1,241 @@
+import bisect
+import threading
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+
+# Lightweight in-process metrics: histograms, counters and gauges kept in
+# plain dicts behind one lock, rendered in Prometheus text format at /metrics.
+
+STAGE_METRIC = "pratyaksh_stage_duration_seconds"
+UPSTREAM_METRIC = "pratyaksh_upstream_duration_seconds"
+REQUEST_METRIC = "pratyaksh_http_request_duration_seconds"
+BATCH_METRIC = "pratyaksh_model_batch_size"
+CACHE_METRIC = "pratyaksh_cache_requests_total"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+_lock = threading.Lock()
+_histograms = {}
+_counters = {}
+_gauges = {}
+_help = {}
+_lru_caches = {}
+
+# Har request ke stage timings (Server-Timing header ke liye), middleware set karta hai
+_request_timings = ContextVar("request_timings", default=None)
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        i = bisect.bisect_left(self.buckets, value)
+        if i < len(self.counts):
+            self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def observe(name, value, buckets=LATENCY_BUCKETS, **labels):
+    key = _key(name, labels)
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = _Histogram(buckets)
+        hist.observe(value)
+
+
+def inc(name, amount=1, **labels):
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def set_gauge(name, value, **labels):
+    with _lock:
+        _gauges[_key(name, labels)] = value
+
+
+def describe(name, text):
+    _help[name] = text
+
+
+def observe_batch_size(model, size):
+    observe(BATCH_METRIC, size, buckets=BATCH_BUCKETS, model=model)
+
+
+def record_cache(cache, hit):
+    inc(CACHE_METRIC, cache=cache, result="hit" if hit else "miss")
+
+
+def register_lru_cache(cache, fn):
+    """Export hit/miss counts of anything with a functools-style cache_info() at scrape time."""
+    _lru_caches[cache] = fn
+
+
+def _record_timing(metric, stage, seconds):
+    observe(metric, seconds, stage=stage)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.append((stage, seconds))
+
+
+class timed:
+    """Time a block or function as a named stage.
+
+        with timed("integrity.ela"): ...
+
+        @timed("vision_ai.ai_detector")
+        def detect(...): ...
+    """
+
+    def __init__(self, stage, metric=STAGE_METRIC):
+        self.stage = stage
+        self.metric = metric
+
+    def __enter__(self):
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _record_timing(self.metric, self.stage, perf_counter() - self._start)
+        return False
+
+    def __call__(self, fn):
+        stage, metric = self.stage, self.metric
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            # Naya instance har call pe, taaki threads ek doosre ka start time na bigaadein
+            with timed(stage, metric):
+                return fn(*args, **kwargs)
+        return wrapper
+
+
+def upstream(name):
+    """Time a call to an external service (GDACS, USGS, Earth Engine...)."""
+    return timed(name, metric=UPSTREAM_METRIC)
+
+
+def current_timings():
+    """Stage timings recorded so far for the in-flight request."""
+    return list(_request_timings.get() or [])
+
+
+def _fmt_labels(labels, extra=()):
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    body = ",".join('%s="%s"' % (k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in items)
+    return "{" + body + "}"
+
+
+def render_prometheus():
+    lines = []
+    with _lock:
+        histograms = sorted((k, (h.buckets, list(h.counts), h.sum, h.count)) for k, h in _histograms.items())
+        counters = sorted(_counters.items())
+        gauges = sorted(_gauges.items())
+
+    for name, info in _lru_caches.items():
+        stats = info.cache_info()
+        counters.append(((CACHE_METRIC, (("cache", name), ("result", "hit"))), stats.hits))
+        counters.append(((CACHE_METRIC, (("cache", name), ("result", "miss"))), stats.misses))
+    counters.sort()
+
+    def header(name, kind, seen):
+        if name in seen:
+            return
+        seen.add(name)
+        if name in _help:
+            lines.append(f"# HELP {name} {_help[name]}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    seen = set()
+    for (name, labels), (buckets, counts, total, count) in histograms:
+        header(name, "histogram", seen)
+        cumulative = 0
+        for bound, n in zip(buckets, counts):
+            cumulative += n
+            lines.append(f"{name}_bucket{_fmt_labels(labels, [('le', bound)])} {cumulative}")
+        lines.append(f"{name}_bucket{_fmt_labels(labels, [('le', '+Inf')])} {count}")
+        lines.append(f"{name}_sum{_fmt_labels(labels)} {total}")
+        lines.append(f"{name}_count{_fmt_labels(labels)} {count}")
+
+    for (name, labels), value in counters:
+        header(name, "counter", seen)
+        lines.append(f"{name}{_fmt_labels(labels)} {value}")
+
+    for (name, labels), value in gauges:
+        header(name, "gauge", seen)
+        lines.append(f"{name}{_fmt_labels(labels)} {value}")
+
+    return "\n".join(lines) + "\n"
+
+
+describe(STAGE_METRIC, "Duration of internal processing stages.")
+describe(UPSTREAM_METRIC, "Latency of calls to external services.")
+describe(REQUEST_METRIC, "End-to-end HTTP request duration.")
+describe(BATCH_METRIC, "Number of inputs per model inference call.")
+describe(CACHE_METRIC, "Cache lookups by result.")
+
+
+def _route_label(scope):
+    # Route template (raw path nahi) taaki tile URLs labels na phulaayein.
+    # Naye FastAPI mein included router flatten nahi hota: route.path mein prefix
+    # nahi hota, poora template effective_route_context mein hota hai.
+    fastapi_scope = scope.get("fastapi")
+    ctx = fastapi_scope.get("effective_route_context") if isinstance(fastapi_scope, dict) else None
+    path = getattr(ctx, "path", None) or getattr(scope.get("route"), "path", None)
+    # Admission se shed requests router tak pahunchti hi nahi; gated path hi label hai
+    return path or scope.get("admission_route") or "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware: request latency histogram and optional Server-Timing header."""
+
+    def __init__(self, app, server_timing=False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = []
+        token = _request_timings.set(timings)
+        start = perf_counter()
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                if self.server_timing:
+                    entries = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings]
+                    entries.append(f"total;dur={(perf_counter() - start) * 1000:.1f}")
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", ", ".join(entries).encode("latin-1")))
+                    # Cross-origin frontend ko bhi timings dikhein
+                    headers.append((b"timing-allow-origin", b"*"))
+                    message = dict(message, headers=headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            observe(REQUEST_METRIC, perf_counter() - start,
+                    method=scope.get("method", ""), route=_route_label(scope), status=status["code"])
+            _request_timings.reset(token)
@@ -1,19 +1,41 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles # Zaroori hai images ke liye
 from app.api.routes import media, analysis, alerts
+from app.core.admission import AdmissionMiddleware, analysis_gate, verify_gate
+from app.core.config import settings
+from app.core.metrics import MetricsMiddleware, render_prometheus
+from app.services.ledger.verification_ledger import start_ledger, stop_ledger
 from dotenv import load_dotenv
 import os
 
 load_dotenv()
 
-app = FastAPI(title="Disaster Authenticity & Analysis System")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Ledger yahin banta hai (import pe nahi); shutdown pe bache hue rows flush
+    start_ledger()
+    yield
+    stop_ledger()
+
+app = FastAPI(title="Disaster Authenticity & Analysis System", lifespan=lifespan)
 
 # Static files setup (Heatmaps save karne ke liye)
 if not os.path.exists("static"):
     os.makedirs("static")
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
+# Admission sabse andar: slot body padhne se pehle milta hai, aur 503 pe bhi
+# CORS headers lagte hain taaki browser response padh sake
+app.add_middleware(AdmissionMiddleware, routes={
+    "/media/verify": verify_gate,
+    "/analysis/deep-damage-assessment": analysis_gate,
+    "/analysis/satellite-damage-assessment": analysis_gate,
+    "/analysis/relief-batch": analysis_gate,
+})
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -22,10 +44,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-stage latency tracing (sabse bahar, taaki poora request time naapa jaye)
+app.add_middleware(MetricsMiddleware, server_timing=settings.SERVER_TIMING)
+
 @app.get("/")
 def read_root():
     return {"message": "Backend Version 2.0: Image-to-Image Damage Analysis Active"}
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
 # Routes include karna
 app.include_router(media.router, prefix="/media", tags=["Media Verification"])
 app.include_router(analysis.router, prefix="/analysis", tags=["Damage Analysis"])
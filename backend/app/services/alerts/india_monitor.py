@@ -2,10 +2,12 @@ import os
 import requests
 from datetime import datetime
 from dotenv import load_dotenv
+from app.core.metrics import timed, upstream
 
 load_dotenv()
 NASA_KEY = os.getenv("NASA_FIRMS_API_KEY")
 
+@timed("alerts.aggregate")
 def get_comprehensive_india_alerts(target_month=None):
     all_events = []
     
@@ -28,7 +30,8 @@ def get_comprehensive_india_alerts(target_month=None):
     # --- 2. LIVE GDACS (Cyclones & Floods - 2026 Live) ---
     try:
         gd_url = "https://www.gdacs.org/gdacsapi/api/events/geteventlist/form/GEOJSON"
-        gd_res = requests.get(gd_url, timeout=5).json()
+        with upstream("gdacs"):
+            gd_res = requests.get(gd_url, timeout=5).json()
         for feat in gd_res.get('features', []):
             p = feat['properties']
             if p.get('country') == "India" or "India" in p.get('eventname', ''):
@@ -49,7 +52,8 @@ def get_comprehensive_india_alerts(target_month=None):
             "&starttime=2025-01-01&minlatitude=6.4&maxlatitude=35.5"
             "&minlongitude=68.1&maxlongitude=97.4&minmagnitude=3.5"
         )
-        eq_res = requests.get(usgs_url, timeout=5).json()
+        with upstream("usgs"):
+            eq_res = requests.get(usgs_url, timeout=5).json()
         for feat in eq_res.get('features', []):
             prop = feat['properties']
             dt_obj = datetime.fromtimestamp(prop['time']/1000)
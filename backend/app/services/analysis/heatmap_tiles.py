@@ -0,0 +1,251 @@
+import cv2
+import numpy as np
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from uuid import uuid4
+from app.core.config import settings
+from app.core.metrics import register_lru_cache
+
+TILE_SIZE = 256
+OVERVIEW_MAX_SIDE = 1024
+# Public static/ ke bahar: maps sirf heatmap routes se serve hote hain
+MAP_DIR = settings.HEATMAP_DIR
+
+_MAP_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+_LEVEL0_SUFFIX = "_0.npy"
+# Last-use disk pe (mtime) itne seconds mein max ek baar likha jata hai
+TOUCH_INTERVAL = 60.0
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class MapLRU:
+    """Thread-safe LRU whose keys start with a map id, so one map's entries can be dropped.
+
+    Exposes cache_info() like functools.lru_cache for the metrics registry.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return True, self._data[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def drop(self, map_ids):
+        with self._lock:
+            for key in [k for k in self._data if k[0] in map_ids]:
+                del self._data[key]
+
+    def cache_info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+
+_map_cache = MapLRU(maxsize=64)
+_tile_cache = MapLRU(maxsize=512)
+
+# map_id -> last use (time.time()), tiles aur meta hits par bhi update hota hai
+_last_used = {}
+_last_touched = {}
+_usage_lock = threading.Lock()
+
+
+def _check_id(map_id: str) -> str:
+    # map_id URL se aata hai, isliye path traversal se bachne ke liye strict check
+    if not _MAP_ID_RE.match(map_id):
+        raise ValueError("Invalid map id")
+    return map_id
+
+
+def _map_path(map_id: str, level: int = 0) -> str:
+    return os.path.join(MAP_DIR, f"{_check_id(map_id)}_{level}.npy")
+
+
+def overview_path(map_id: str) -> str:
+    return os.path.join(MAP_DIR, f"{_check_id(map_id)}_overview.png")
+
+
+def max_zoom(shape) -> int:
+    """Zoom level at which one tile pixel equals one source pixel."""
+    longest = max(shape[0], shape[1])
+    z = 0
+    while TILE_SIZE * (1 << z) < longest:
+        z += 1
+    return z
+
+
+def _min_pool(diff: np.ndarray) -> np.ndarray:
+    # 2x2 ka minimum: low SSIM = damage, isliye coarse zoom pe chhota damage bhi dikhta rahe
+    h, w = diff.shape
+    if h % 2 or w % 2:
+        diff = np.pad(diff, ((0, h % 2), (0, w % 2)), constant_values=255)
+    return diff.reshape(diff.shape[0] // 2, 2, diff.shape[1] // 2, 2).min(axis=(1, 3))
+
+
+def save_diff_map(diff: np.ndarray) -> str:
+    """Persist a uint8 SSIM diff map with its min-pooled pyramid and return its id."""
+    os.makedirs(MAP_DIR, exist_ok=True)
+    map_id = uuid4().hex
+    level = np.ascontiguousarray(diff, dtype=np.uint8)
+    for z in range(max_zoom(level.shape) + 1):
+        if z:
+            level = _min_pool(level)
+        np.save(_map_path(map_id, z), level)
+    prune_maps(keep=map_id)
+    return map_id
+
+
+def _delete_map(map_id: str):
+    for name in os.listdir(MAP_DIR):
+        if name.startswith(map_id + "_"):
+            try:
+                os.remove(os.path.join(MAP_DIR, name))
+            except FileNotFoundError:
+                pass
+
+
+def _touch(map_id: str):
+    """Record a use of the map; persisted to the level-0 mtime at most every TOUCH_INTERVAL."""
+    now = time.time()
+    with _usage_lock:
+        _last_used[map_id] = now
+        if now - _last_touched.get(map_id, 0.0) < TOUCH_INTERVAL:
+            return
+        _last_touched[map_id] = now
+    try:
+        os.utime(_map_path(map_id))
+    except FileNotFoundError:
+        pass
+
+
+def prune_maps(keep: str = None):
+    """Evict least recently used maps beyond HEATMAP_MAX_MAPS or older than HEATMAP_MAX_AGE."""
+    if not os.path.isdir(MAP_DIR):
+        return
+    maps = []
+    for name in os.listdir(MAP_DIR):
+        if name.endswith(_LEVEL0_SUFFIX):
+            map_id = name[:-len(_LEVEL0_SUFFIX)]
+            try:
+                used_at = os.path.getmtime(os.path.join(MAP_DIR, name))
+            except FileNotFoundError:
+                continue
+            # In-memory last use throttled mtime se naya ho sakta hai
+            with _usage_lock:
+                used_at = max(used_at, _last_used.get(map_id, 0.0))
+            maps.append((used_at, map_id))
+    maps.sort(reverse=True)  # sabse recently used pehle
+
+    cutoff = time.time() - settings.HEATMAP_MAX_AGE
+    evict = {map_id for i, (used_at, map_id) in enumerate(maps)
+             if map_id != keep and (i >= settings.HEATMAP_MAX_MAPS or used_at < cutoff)}
+    if not evict:
+        return
+    # Sirf evicted maps ke mmaps aur tiles hatao, live maps ka cache bana rahe
+    _map_cache.drop(evict)
+    _tile_cache.drop(evict)
+    with _usage_lock:
+        for map_id in evict:
+            _last_used.pop(map_id, None)
+            _last_touched.pop(map_id, None)
+    for map_id in evict:
+        _delete_map(map_id)
+
+
+def load_diff_map(map_id: str, level: int = 0) -> np.ndarray:
+    # Memory-mapped: tiles sirf apna hissa disk se padhte hain
+    key = (map_id, level)
+    hit, diff = _map_cache.get(key)
+    if not hit:
+        diff = np.load(_map_path(map_id, level), mmap_mode="r")
+        _map_cache.put(key, diff)
+    return diff
+
+
+def map_info(map_id: str) -> dict:
+    diff = load_diff_map(map_id)
+    _touch(map_id)
+    return {
+        "map_id": map_id,
+        "width": int(diff.shape[1]),
+        "height": int(diff.shape[0]),
+        "tile_size": TILE_SIZE,
+        "min_zoom": 0,
+        "max_zoom": max_zoom(diff.shape),
+    }
+
+
+def _colorize(diff: np.ndarray) -> np.ndarray:
+    return cv2.applyColorMap(diff, cv2.COLORMAP_JET)
+
+
+def _render_tile(map_id: str, z: int, x: int, y: int):
+    mz = max_zoom(load_diff_map(map_id).shape)
+    if z < 0 or z > mz:
+        return None
+
+    # Har zoom ka apna pyramid level hai, tile us level ka seedha 256x256 window hai
+    level = load_diff_map(map_id, mz - z)
+    y0, x0 = y * TILE_SIZE, x * TILE_SIZE
+    if x < 0 or y < 0 or y0 >= level.shape[0] or x0 >= level.shape[1]:
+        return None
+
+    window = np.asarray(level[y0:y0 + TILE_SIZE, x0:x0 + TILE_SIZE])
+    tile = np.zeros((TILE_SIZE, TILE_SIZE), dtype=np.uint8)
+    tile[:window.shape[0], :window.shape[1]] = window
+
+    rgba = cv2.cvtColor(_colorize(tile), cv2.COLOR_BGR2BGRA)
+    # Map ke bahar wala padding transparent rahe
+    rgba[window.shape[0]:, :, 3] = 0
+    rgba[:, window.shape[1]:, 3] = 0
+
+    ok, buf = cv2.imencode(".png", rgba)
+    return buf.tobytes() if ok else None
+
+
+def render_tile(map_id: str, z: int, x: int, y: int):
+    """Render one XYZ tile as PNG bytes (LRU cached), or None if it lies outside the map."""
+    key = (map_id, z, x, y)
+    hit, tile = _tile_cache.get(key)
+    if not hit:
+        tile = _render_tile(map_id, z, x, y)
+        _tile_cache.put(key, tile)
+    _touch(map_id)
+    return tile
+
+
+register_lru_cache("heatmap_tile", _tile_cache)
+register_lru_cache("heatmap_map", _map_cache)
+
+
+def write_overview(map_id: str, max_side: int = OVERVIEW_MAX_SIDE) -> str:
+    """Write a JET overview PNG (used by the PDF and the preview) and return its URL path."""
+    mz = max_zoom(load_diff_map(map_id).shape)
+    # Pehla pyramid level jo max_side mein fit ho: tiles jaisa hi min-pooled view
+    level = 0
+    while level < mz and max(load_diff_map(map_id, level).shape) > max_side:
+        level += 1
+    small = np.asarray(load_diff_map(map_id, level))
+
+    cv2.imwrite(overview_path(map_id), _colorize(small))
+    return f"analysis/heatmap/{map_id}/overview.png"
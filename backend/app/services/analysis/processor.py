@@ -1,25 +1,33 @@
 import cv2
 import numpy as np
 from skimage.metrics import structural_similarity as ssim
-import os
+from app.services.analysis.heatmap_tiles import save_diff_map, write_overview
+from app.core.metrics import timed
 
+def _load_bgr(image):
+    # Path ya array dono chalte hain; arrays satellite chips (RGB / RGBN) hote hain
+    if isinstance(image, str):
+        return cv2.imread(image)
+    return cv2.cvtColor(np.ascontiguousarray(image[..., :3]), cv2.COLOR_RGB2BGR)
+
+@timed("analysis.deep_analysis")
 def run_deep_analysis(before_path, after_path):
-    img1 = cv2.imread(before_path)
-    img2 = cv2.imread(after_path)
+    img1 = _load_bgr(before_path)
+    img2 = _load_bgr(after_path)
     img2 = cv2.resize(img2, (img1.shape[1], img1.shape[0]))
     
     gray1 = cv2.cvtColor(img1, cv2.COLOR_BGR2GRAY)
     gray2 = cv2.cvtColor(img2, cv2.COLOR_BGR2GRAY)
     
-    (score, diff) = ssim(gray1, gray2, full=True)
+    with timed("analysis.ssim"):
+        (score, diff) = ssim(gray1, gray2, full=True)
     damage_percent = (1 - score) * 100
     
-    # Heatmap logic
-    diff = (diff * 255).astype("uint8")
-    heatmap = cv2.applyColorMap(diff, cv2.COLORMAP_JET)
-    os.makedirs("static", exist_ok=True)
-    heatmap_path = "static/heatmap_output.png"
-    cv2.imwrite(heatmap_path, heatmap)
+    # Heatmap logic: full-res diff compact uint8 array ke roop mein save hota hai,
+    # tiles lazily render hote hain aur PDF/preview ke liye sirf chhota overview
+    diff = (np.clip(diff, 0, 1) * 255).astype("uint8")
+    map_id = save_diff_map(diff)
+    heatmap_url = write_overview(map_id)
     
     # Severity & Type
     severity = "Critical" if damage_percent > 50 else "Moderate" if damage_percent > 20 else "Low"
@@ -33,5 +41,7 @@ def run_deep_analysis(before_path, after_path):
         "severity": severity,
         "type": "Structural/Terrain Change",
         "estimated_cost": f"₹ {round(estimated_cost_in_rupees, 2)}", # Symbol updated to ₹
-        "heatmap_url": heatmap_path
+        "heatmap_url": heatmap_url,
+        "heatmap_id": map_id,
+        "heatmap_tiles": f"/analysis/heatmap/{map_id}/{{z}}/{{x}}/{{y}}.png"
     }
\ No newline at end of file
@@ -0,0 +1,78 @@
+import os
+import re
+import time
+from uuid import uuid4
+from app.core.config import settings
+
+# Rendered PDFs ka short-lived store, per-request report_id ke saath.
+# Disk pe hai (memory mein nahi) taaki multiple uvicorn workers mein se koi bhi
+# download serve kar sake. Link REPORT_TTL tak valid rehta hai; store
+# REPORT_STORE_MAX_BYTES se bada ho to sabse purani reports pehle hat-ti hain.
+REPORT_DIR = settings.REPORT_DIR
+
+_REPORT_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+
+def _report_path(kind: str, report_id: str) -> str:
+    # report_id URL se aata hai, path traversal se bachne ke liye strict check
+    if not _REPORT_ID_RE.match(report_id):
+        raise ValueError("Invalid report id")
+    return os.path.join(REPORT_DIR, f"{kind}_{report_id}.pdf")
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def store_report(kind: str, pdf: bytes) -> str:
+    """Persist a rendered PDF and return its report id."""
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    report_id = uuid4().hex
+    path = _report_path(kind, report_id)
+    # Atomic write: doosra worker aadhi likhi file kabhi na padhe
+    tmp_path = f"{path}.{uuid4().hex}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(pdf)
+    os.replace(tmp_path, path)
+    prune_reports(keep=path)
+    return report_id
+
+
+def load_report(kind: str, report_id: str):
+    """PDF bytes for a report, or None if it is unknown or older than REPORT_TTL."""
+    try:
+        path = _report_path(kind, report_id)
+        if time.time() - os.path.getmtime(path) > settings.REPORT_TTL:
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+    except (ValueError, FileNotFoundError):
+        return None
+
+
+def prune_reports(keep: str = None):
+    """Delete expired reports, then the oldest ones while the store exceeds its byte budget."""
+    now = time.time()
+    reports = []
+    for name in os.listdir(REPORT_DIR):
+        path = os.path.join(REPORT_DIR, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        # Expired reports aur crash se bache .tmp files
+        if now - stat.st_mtime > settings.REPORT_TTL:
+            _remove(path)
+        elif name.endswith(".pdf"):
+            reports.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in reports)
+    for _, size, path in sorted(reports):  # sabse purani pehle
+        if total <= settings.REPORT_STORE_MAX_BYTES:
+            break
+        if path != keep:
+            _remove(path)
+            total -= size
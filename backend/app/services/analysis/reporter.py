@@ -1,14 +1,11 @@
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
+import io
+from app.core.metrics import timed
+from app.services.analysis.heatmap_tiles import overview_path
 import os
 
-def create_pdf_report(data, filename="Damage_Report.pdf"):
-    # Pehle purani report delete karo agar exist karti hai
-    if os.path.exists(filename):
-        os.remove(filename)
-
-    c = canvas.Canvas(filename, pagesize=letter)
-    
+def _draw_damage_page(c, data):
     # Title
     c.setFont("Helvetica-Bold", 18)
     c.drawString(100, 750, "Post-Disaster Damage Assessment Report")
@@ -23,11 +20,18 @@ def create_pdf_report(data, filename="Damage_Report.pdf"):
     
     c.drawString(100, 650, f"Analysis Type: {data['type']}")
     
-    # Heatmap image
-    if os.path.exists(data['heatmap_url']):
+    # Heatmap image (downsampled overview, full-res map tiles se serve hota hai)
+    heatmap = overview_path(data['heatmap_id']) if data.get('heatmap_id') else None
+    if heatmap and os.path.exists(heatmap):
         c.drawString(100, 610, "Damage Heatmap (Visual Analysis):")
         # Image placement
-        c.drawImage(data['heatmap_url'], 100, 320, width=400, height=250)
-    
+        c.drawImage(heatmap, 100, 320, width=400, height=250, preserveAspectRatio=True)
+
+@timed("analysis.pdf_report")
+def create_pdf_report(data) -> bytes:
+    # Disk pe file likhne ke bajaye memory buffer mein render karo
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf, pagesize=letter)
+    _draw_damage_page(c, data)
     c.save()
-    return filename
\ No newline at end of file
+    return buf.getvalue()
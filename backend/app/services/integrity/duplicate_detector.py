@@ -1,12 +1,23 @@
 from PIL import Image
+import hashlib
 import imagehash
+from app.core.metrics import timed
 
 HASH_DB = set()
 
+@timed("integrity.phash")
 def compute_hash(file_path: str) -> str:
     image = Image.open(file_path)
     return str(imagehash.phash(image))
 
+@timed("integrity.sha256")
+def compute_sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 def is_duplicate(file_path: str) -> bool:
     img_hash = compute_hash(file_path)
     duplicate = img_hash in HASH_DB
@@ -1,6 +1,8 @@
 from PIL import Image
 from PIL.ExifTags import TAGS, GPSTAGS
+from app.core.metrics import timed
 
+@timed("integrity.exif")
 def extract_exif(file_path: str) -> dict:
     try:
         image = Image.open(file_path)
@@ -1,16 +1,19 @@
 import cv2
 import numpy as np
 from PIL import Image, ImageChops
-import os
+import io
+from app.core.metrics import timed
 
+@timed("integrity.ela")
 def detect_tampering(file_path: str) -> dict:
     try:
-        temp_file = "temp_ela.jpg"
         original = Image.open(file_path).convert('RGB')
         
-        # 1. Image ko temporary save karo
-        original.save(temp_file, 'JPEG', quality=90)
-        temporary = Image.open(temp_file)
+        # 1. Image ko memory mein re-save karo (shared temp file concurrent requests mein takraati thi)
+        buf = io.BytesIO()
+        original.save(buf, 'JPEG', quality=90)
+        buf.seek(0)
+        temporary = Image.open(buf)
         
         # 2. Difference nikalo
         diff = ImageChops.difference(original, temporary)
@@ -28,10 +31,6 @@ def detect_tampering(file_path: str) -> dict:
         stats = np.array(diff).mean()
         is_suspicious = bool(stats > 5.0) 
         
-        # Cleanup
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
-            
         return {
             "suspicious": is_suspicious,
             "score": round(stats, 2),
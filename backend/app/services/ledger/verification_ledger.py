@@ -0,0 +1,236 @@
+import json
+import queue
+import sqlite3
+import threading
+import time
+from time import perf_counter
+
+from app.core.config import settings
+from app.core.metrics import BATCH_BUCKETS, describe, inc, observe, set_gauge
+
+# Persistent audit trail of every verification / assessment result.
+# Requests sirf in-process queue mein row daalte hain; ek background thread
+# rows ko batches mein (ek transaction per batch) SQLite (WAL) mein likhta hai.
+# Ledger app lifespan mein banta hai (start_ledger); import pe kuch nahi hota.
+
+FLUSH_METRIC = "pratyaksh_ledger_flush_seconds"
+BATCH_METRIC = "pratyaksh_ledger_batch_rows"
+DEPTH_METRIC = "pratyaksh_ledger_queue_depth"
+DROPPED_METRIC = "pratyaksh_ledger_dropped_total"
+FAILED_METRIC = "pratyaksh_ledger_failed_rows_total"
+
+describe(FLUSH_METRIC, "Time to write one ledger batch.")
+describe(BATCH_METRIC, "Rows per ledger batch transaction.")
+describe(DEPTH_METRIC, "Ledger rows waiting to be written.")
+describe(DROPPED_METRIC, "Ledger rows dropped because the write queue was full.")
+describe(FAILED_METRIC, "Ledger rows lost because their batch write failed.")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS verification_ledger (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    kind TEXT NOT NULL,
+    sha256 TEXT,
+    phash TEXT,
+    lat REAL,
+    lon REAL,
+    verdict TEXT,
+    timings TEXT,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_ledger_sha256 ON verification_ledger (sha256);
+CREATE INDEX IF NOT EXISTS idx_ledger_phash ON verification_ledger (phash);
+CREATE INDEX IF NOT EXISTS idx_ledger_created_at ON verification_ledger (created_at);
+CREATE INDEX IF NOT EXISTS idx_ledger_location ON verification_ledger (lat, lon);
+"""
+
+INSERT_SQL = """
+INSERT INTO verification_ledger
+    (created_at, kind, sha256, phash, lat, lon, verdict, timings, result)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+COLUMNS = ["id", "created_at", "kind", "sha256", "phash", "lat", "lon", "verdict", "timings", "result"]
+
+_STOP = object()
+
+
+def sqlite_path(database_url: str) -> str:
+    # "sqlite:///./disaster_response.db" -> "./disaster_response.db"
+    prefix = "sqlite:///"
+    if not database_url.startswith(prefix):
+        raise ValueError(f"Ledger needs a sqlite:/// DATABASE_URL, got '{database_url}'")
+    path = database_url[len(prefix):]
+    # Writer, start() aur query() alag connections kholte hain; :memory: har connection
+    # ka apna khaali database hota, saare rows chupchaap gayab
+    if path in ("", ":memory:"):
+        raise ValueError(f"Ledger needs a file-backed sqlite database, got '{database_url}'")
+    return path
+
+
+class WriteBehindLedger:
+    def __init__(self, path, batch_size=200, flush_interval=0.5, max_queue=10000):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            conn = self._connect()
+            conn.executescript(SCHEMA)
+            conn.close()
+            self._thread = threading.Thread(target=self._run, name="ledger-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=10.0):
+        """Flush whatever is queued and stop the writer thread."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def record(self, kind, sha256=None, phash=None, lat=None, lon=None,
+               verdict=None, timings=None, result=None):
+        """Queue one ledger row; never blocks the caller."""
+        entry = (time.time(), kind, sha256, phash, lat, lon, verdict, timings, result)
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            inc(DROPPED_METRIC)
+
+    def _row(self, entry):
+        # JSON encoding bhi writer thread mein, request path pe nahi
+        created_at, kind, sha256, phash, lat, lon, verdict, timings, result = entry
+        timings_json = json.dumps({stage: round(sec * 1000, 3) for stage, sec in timings or []})
+        result_json = json.dumps(result, default=str) if result is not None else None
+        return (created_at, kind, sha256, phash, lat, lon, verdict, timings_json, result_json)
+
+    def _write(self, conn, batch):
+        start = perf_counter()
+        with conn:
+            conn.executemany(INSERT_SQL, [self._row(entry) for entry in batch])
+        observe(FLUSH_METRIC, perf_counter() - start)
+        observe(BATCH_METRIC, len(batch), buckets=BATCH_BUCKETS)
+
+    def _run(self):
+        conn = self._connect()
+        stopping = False
+        try:
+            while not stopping:
+                try:
+                    first = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    continue
+                batch = []
+                if first is _STOP:
+                    stopping = True
+                else:
+                    batch.append(first)
+
+                # Jitna queue mein pada hai utha lo, ek transaction mein likho
+                while len(batch) < self.batch_size:
+                    try:
+                        entry = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if entry is _STOP:
+                        stopping = True
+                        continue
+                    batch.append(entry)
+
+                set_gauge(DEPTH_METRIC, self._queue.qsize())
+                if batch:
+                    try:
+                        self._write(conn, batch)
+                    except Exception as e:
+                        # Ek kharab batch writer thread ko nahi maarna chahiye
+                        inc(FAILED_METRIC, len(batch))
+                        print(f"Ledger write failed: {e}")
+        finally:
+            conn.close()
+
+    def query(self, sha256=None, phash=None, since=None, until=None,
+              min_lat=None, max_lat=None, min_lon=None, max_lon=None, limit=100):
+        """Read ledger rows, newest first. Runs on its own connection (WAL allows it)."""
+        clauses, params = [], []
+        for column, op, value in (
+            ("sha256", "=", sha256), ("phash", "=", phash),
+            ("created_at", ">=", since), ("created_at", "<=", until),
+            ("lat", ">=", min_lat), ("lat", "<=", max_lat),
+            ("lon", ">=", min_lon), ("lon", "<=", max_lon),
+        ):
+            if value is not None:
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+
+        sql = f"SELECT {', '.join(COLUMNS)} FROM verification_ledger"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_at DESC LIMIT ?"
+        params.append(int(limit))
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+        out = []
+        for row in rows:
+            item = dict(zip(COLUMNS, row))
+            item["timings"] = json.loads(item["timings"]) if item["timings"] else {}
+            item["result"] = json.loads(item["result"]) if item["result"] else None
+            out.append(item)
+        return out
+
+
+_ledger = None
+
+
+def start_ledger():
+    """Create and start the ledger from DATABASE_URL; called from the app lifespan.
+
+    Non-sqlite URLs leave the ledger disabled (with a warning) instead of failing startup.
+    """
+    global _ledger
+    try:
+        path = sqlite_path(settings.DATABASE_URL)
+    except ValueError as e:
+        print(f"Warning: verification ledger disabled: {e}")
+        return None
+    _ledger = WriteBehindLedger(
+        path,
+        batch_size=settings.LEDGER_BATCH_SIZE,
+        flush_interval=settings.LEDGER_FLUSH_INTERVAL,
+        max_queue=settings.LEDGER_MAX_QUEUE,
+    )
+    _ledger.start()
+    return _ledger
+
+
+def stop_ledger():
+    global _ledger
+    if _ledger is not None:
+        _ledger.stop()
+        _ledger = None
+
+
+def get_ledger():
+    return _ledger
+
+
+def record(kind, **fields):
+    """Queue a row on the running ledger; no-op while the ledger is disabled."""
+    if _ledger is not None:
+        _ledger.record(kind, **fields)
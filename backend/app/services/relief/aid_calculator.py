@@ -1,100 +1,163 @@
-def calculate_relief_needs(disaster_type, location_context, population):
-    aid_blueprint = []
-    dtype = disaster_type.lower()
+import numpy as np
+from functools import lru_cache
+from app.services.relief.aid_rules import AID_RULES, DISASTER_KEYWORDS
+from app.core.metrics import timed, register_lru_cache
+
+HELPLINE = "1070 (National), 1077 (District)"
+# int64 columns: itni population tak quantity * unit_cost (aur 1000-district batch sum) overflow nahi hota
+MAX_POPULATION = 10**10
+EXTRA_INFO = "Priority: Children under 5 and Senior Citizens. Ensure safe disposal of dignity kits."
+
+# Rule table ko ek baar NumPy columns mein badal lo
+_PER_PERSON = np.array([r["per_person"] for r in AID_RULES], dtype=np.int64)
+_PER_PEOPLE = np.array([r["per_people"] for r in AID_RULES], dtype=np.int64)
+_MIN_QTY = np.array([r["min_qty"] for r in AID_RULES], dtype=np.int64)
+_UNIT_COST = np.array([r["unit_cost"] for r in AID_RULES], dtype=np.int64)
+_LUMPSUM = np.array([r["lumpsum"] for r in AID_RULES], dtype=np.int64)
+
+
+def _disaster_key(dtype: str):
+    for keyword in DISASTER_KEYWORDS:
+        if keyword in dtype:
+            return keyword
+    return None
+
+
+@lru_cache(maxsize=1024)
+def _rule_mask(disaster_type: str, location_context: str) -> np.ndarray:
+    """Which catalogue items apply to a (disaster, context) pair; memoized."""
+    dkey = _disaster_key(disaster_type.lower())
     lcontext = location_context.lower()
+    mask = np.array([
+        (r["disaster"] is None or r["disaster"] == dkey)
+        and (r["context"] is None or r["context"] in lcontext)
+        for r in AID_RULES
+    ], dtype=bool)
+    mask.setflags(write=False)
+    return mask
 
-    # --- 1. UNIVERSAL ITEMS (Har disaster ke liye zaroori) ---
-    # Ration & Water
-    aid_blueprint.append({
-        "item": "Ration Kit (Rice, Atta, Dal, Oil, Salt, Tea)",
-        "quantity": f"{population} Kits",
-        "unit_cost": "₹950",
-        "total_cost": population * 950,
-        "source": "FCI / State Civil Supplies"
-    })
-    aid_blueprint.append({
-        "item": "Drinking Water (2L Sealed Bottles)",
-        "quantity": f"{population * 3} Units",
-        "unit_cost": "₹20",
-        "total_cost": population * 3 * 20,
-        "source": "Rail Neer / Local Bottlers"
-    })
-    # Hygiene & Dignity
-    aid_blueprint.append({
-        "item": "Dignity Kit (Sanitary Pads, Soap, Toothbrush, Towel)",
-        "quantity": f"{population // 2} Kits",
-        "unit_cost": "₹450",
-        "total_cost": (population // 2) * 450,
-        "source": "NGOs (Goonj/Red Cross)"
-    })
-    # Lighting & Bedding
-    aid_blueprint.append({
-        "item": "Emergency Solar Lantern & Power Bank",
-        "quantity": f"{population // 5} Units",
-        "unit_cost": "₹800",
-        "total_cost": (population // 5) * 800,
-        "source": "EESL / Local Electronic Markets"
-    })
-    aid_blueprint.append({
-        "item": "Bedding (Plastic Mat & Fleece Blanket)",
-        "quantity": f"{population * 2} Units",
-        "unit_cost": "₹350",
-        "total_cost": population * 2 * 350,
-        "source": "Handloom Centers / Local Mandi"
-    })
-
-    # --- 2. DISASTER SPECIFIC AIDS ---
-    if "flood" in dtype:
-        aid_blueprint.append({
-            "item": "Chlorine Tablets & Water Purifiers",
-            "quantity": f"{population * 20} Tablets",
-            "unit_cost": "₹2",
-            "total_cost": population * 20 * 2,
-            "source": "Nearest PHC / Health Dept."
-        })
-        aid_blueprint.append({
-            "item": "Emergency Boats & Life Jackets",
-            "quantity": f"{max(1, population // 100)} Units",
-            "unit_cost": "₹55,000",
-            "total_cost": max(1, population // 100) * 55000,
-            "source": "NDRF / SDRF Regional Hubs"
-        })
 
-    elif "earthquake" in dtype:
-        aid_blueprint.append({
-            "item": "Temporary Shelters (Prefab Tents)",
-            "quantity": f"{population // 5} Tents",
-            "unit_cost": "₹4,500",
-            "total_cost": (population // 5) * 450,
-            "source": "Govt Infrastructure Dept."
-        })
-        aid_blueprint.append({
-            "item": "First Aid Medical Kits (Trauma Care)",
-            "quantity": f"{population // 2} Kits",
-            "unit_cost": "₹500",
-            "total_cost": (population // 2) * 500,
-            "source": "Jan Aushadhi Kendra"
-        })
+register_lru_cache("relief_rule_mask", _rule_mask)
+
+
+@timed("relief.matrix")
+def compute_relief_matrix(disaster_types, location_contexts, populations):
+    """Vectorized quantities and costs for many locations at once.
+
+    Returns (quantities, costs, mask), each shaped (locations, catalogue items).
+    """
+    for population in populations:
+        if not 0 <= population <= MAX_POPULATION:
+            raise ValueError(f"Population must be between 0 and {MAX_POPULATION:,}, got {population}.")
+    pop = np.asarray(populations, dtype=np.int64).reshape(-1, 1)
 
-    # --- 3. RURAL ADD-ONS ---
-    if "rural" in lcontext:
-        aid_blueprint.append({
-            "item": "Cattle Fodder & Livestock Support",
-            "quantity": "Bulk Supply",
-            "unit_cost": "Lumpsum",
-            "total_cost": 30000,
-            "source": "Animal Husbandry Dept."
+    # Har unique (disaster, context) ka mask ek hi baar banta hai
+    groups = {}
+    group_idx = np.fromiter(
+        (groups.setdefault(key, len(groups)) for key in zip(disaster_types, location_contexts)),
+        dtype=np.intp, count=pop.shape[0],
+    )
+    if not groups:
+        empty = np.zeros((0, len(AID_RULES)), dtype=np.int64)
+        return empty, empty, empty.astype(bool)
+    mask = np.stack([_rule_mask(*key) for key in groups])[group_idx]
+
+    quantities = np.maximum(pop * _PER_PERSON // _PER_PEOPLE, _MIN_QTY) * mask
+    costs = quantities * _UNIT_COST + _LUMPSUM * mask
+    return quantities, costs, mask
+
+
+def _batch_quantity(rule, qty):
+    # Lumpsum items (per_person 0) ki koi ginti nahi hoti, label dikhao
+    if rule["per_person"] == 0:
+        return rule.get("quantity_label")
+    return int(qty)
+
+
+def _aid_items(quantities, costs, mask):
+    items = []
+    for i in np.flatnonzero(mask):
+        rule = AID_RULES[i]
+        qty = int(quantities[i])
+        items.append({
+            "item": rule["item"],
+            "quantity": rule.get("quantity_label") or f"{qty} {rule['unit']}",
+            "unit_cost": rule.get("unit_cost_label") or f"₹{rule['unit_cost']:,}",
+            "total_cost": int(costs[i]),
+            "source": rule["source"],
         })
+    return items
 
-    # Total Budget Calculation
-    total_budget = sum(item['total_cost'] for item in aid_blueprint if isinstance(item['total_cost'], (int, float)))
 
+def _format_plan(disaster_type, location_context, population, quantities, costs, mask):
+    total_budget = int(costs.sum())
     return {
         "disaster": disaster_type.capitalize(),
         "location_type": location_context.capitalize(),
         "estimated_impact": population,
-        "aid_items": aid_blueprint,
+        "aid_items": _aid_items(quantities, costs, mask),
         "total_budget": f"₹{total_budget:,}",
-        "official_helpline": "1070 (National), 1077 (District)",
-        "extra_info": "Priority: Children under 5 and Senior Citizens. Ensure safe disposal of dignity kits."
-    }
\ No newline at end of file
+        "official_helpline": HELPLINE,
+        "extra_info": EXTRA_INFO,
+    }
+
+
+def calculate_relief_needs(disaster_type, location_context, population):
+    quantities, costs, mask = compute_relief_matrix([disaster_type], [location_context], [population])
+    return _format_plan(disaster_type, location_context, population, quantities[0], costs[0], mask[0])
+
+
+def plan_relief_batch(locations, include_plans=False):
+    """Relief plans for many districts, with aggregated totals.
+
+    `locations` is a list of dicts with district, disaster_type,
+    location_context and population_count.
+    """
+    disasters = [loc["disaster_type"] for loc in locations]
+    contexts = [loc["location_context"] for loc in locations]
+    populations = [loc["population_count"] for loc in locations]
+    quantities, costs, mask = compute_relief_matrix(disasters, contexts, populations)
+    budgets = costs.sum(axis=1)
+
+    per_district = []
+    for i, loc in enumerate(locations):
+        row = {
+            "district": loc.get("district"),
+            "disaster": disasters[i].capitalize(),
+            "location_type": contexts[i].capitalize(),
+            "population": int(populations[i]),
+            "total_budget": int(budgets[i]),
+            "items": {
+                AID_RULES[j]["item"]: _batch_quantity(AID_RULES[j], quantities[i, j])
+                for j in np.flatnonzero(mask[i])
+            },
+        }
+        per_district.append(row)
+
+    # Aggregate: column-wise sums poore batch ke liye
+    item_qty = quantities.sum(axis=0)
+    item_cost = costs.sum(axis=0)
+    used = mask.any(axis=0)
+    aggregate = {
+        "districts": len(locations),
+        "population": int(np.sum(populations)),
+        "total_budget": int(budgets.sum()),
+        "items": [
+            {
+                "item": AID_RULES[j]["item"],
+                "quantity": _batch_quantity(AID_RULES[j], item_qty[j]),
+                "total_cost": int(item_cost[j]),
+            }
+            for j in np.flatnonzero(used)
+        ],
+    }
+
+    result = {"per_district": per_district, "aggregate": aggregate}
+    if include_plans:
+        plans = []
+        for i, loc in enumerate(locations):
+            plan = _format_plan(disasters[i], contexts[i], populations[i], quantities[i], costs[i], mask[i])
+            plan["district"] = loc.get("district")
+            plans.append(plan)
+        result["plans"] = plans
+    return result
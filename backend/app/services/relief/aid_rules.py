@@ -0,0 +1,89 @@
+# Declarative relief item catalogue.
+#
+# Quantity = max(min_qty, population * per_person // per_people)
+# Total    = quantity * unit_cost + lumpsum
+#
+# "disaster": None matlab har disaster ke liye, warna keyword (DISASTER_KEYWORDS dekho)
+# "context":  None matlab har location ke liye, warna location_context mein keyword
+
+# Order matters: pehla matching keyword jeet-ta hai (purana if/elif behaviour)
+DISASTER_KEYWORDS = ["flood", "earthquake"]
+
+AID_RULES = [
+    # --- 1. UNIVERSAL ITEMS (Har disaster ke liye zaroori) ---
+    {
+        "item": "Ration Kit (Rice, Atta, Dal, Oil, Salt, Tea)",
+        "unit": "Kits", "per_person": 1, "per_people": 1, "min_qty": 0,
+        "unit_cost": 950, "lumpsum": 0,
+        "source": "FCI / State Civil Supplies",
+        "disaster": None, "context": None,
+    },
+    {
+        "item": "Drinking Water (2L Sealed Bottles)",
+        "unit": "Units", "per_person": 3, "per_people": 1, "min_qty": 0,
+        "unit_cost": 20, "lumpsum": 0,
+        "source": "Rail Neer / Local Bottlers",
+        "disaster": None, "context": None,
+    },
+    {
+        "item": "Dignity Kit (Sanitary Pads, Soap, Toothbrush, Towel)",
+        "unit": "Kits", "per_person": 1, "per_people": 2, "min_qty": 0,
+        "unit_cost": 450, "lumpsum": 0,
+        "source": "NGOs (Goonj/Red Cross)",
+        "disaster": None, "context": None,
+    },
+    {
+        "item": "Emergency Solar Lantern & Power Bank",
+        "unit": "Units", "per_person": 1, "per_people": 5, "min_qty": 0,
+        "unit_cost": 800, "lumpsum": 0,
+        "source": "EESL / Local Electronic Markets",
+        "disaster": None, "context": None,
+    },
+    {
+        "item": "Bedding (Plastic Mat & Fleece Blanket)",
+        "unit": "Units", "per_person": 2, "per_people": 1, "min_qty": 0,
+        "unit_cost": 350, "lumpsum": 0,
+        "source": "Handloom Centers / Local Mandi",
+        "disaster": None, "context": None,
+    },
+
+    # --- 2. DISASTER SPECIFIC AIDS ---
+    {
+        "item": "Chlorine Tablets & Water Purifiers",
+        "unit": "Tablets", "per_person": 20, "per_people": 1, "min_qty": 0,
+        "unit_cost": 2, "lumpsum": 0,
+        "source": "Nearest PHC / Health Dept.",
+        "disaster": "flood", "context": None,
+    },
+    {
+        "item": "Emergency Boats & Life Jackets",
+        "unit": "Units", "per_person": 1, "per_people": 100, "min_qty": 1,
+        "unit_cost": 55000, "lumpsum": 0,
+        "source": "NDRF / SDRF Regional Hubs",
+        "disaster": "flood", "context": None,
+    },
+    {
+        "item": "Temporary Shelters (Prefab Tents)",
+        "unit": "Tents", "per_person": 1, "per_people": 5, "min_qty": 0,
+        "unit_cost": 4500, "lumpsum": 0,
+        "source": "Govt Infrastructure Dept.",
+        "disaster": "earthquake", "context": None,
+    },
+    {
+        "item": "First Aid Medical Kits (Trauma Care)",
+        "unit": "Kits", "per_person": 1, "per_people": 2, "min_qty": 0,
+        "unit_cost": 500, "lumpsum": 0,
+        "source": "Jan Aushadhi Kendra",
+        "disaster": "earthquake", "context": None,
+    },
+
+    # --- 3. RURAL ADD-ONS ---
+    {
+        "item": "Cattle Fodder & Livestock Support",
+        "unit": None, "per_person": 0, "per_people": 1, "min_qty": 0,
+        "unit_cost": 0, "lumpsum": 30000,
+        "quantity_label": "Bulk Supply", "unit_cost_label": "Lumpsum",
+        "source": "Animal Husbandry Dept.",
+        "disaster": None, "context": "rural",
+    },
+]
@@ -2,43 +2,69 @@ from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 from reportlab.lib import colors
 from reportlab.platypus import Table, TableStyle
-import os
+import io
+from app.core.metrics import timed
 
-def create_relief_pdf(data, filename="Relief_Plan.pdf"):
-    c = canvas.Canvas(filename, pagesize=letter)
-    width, height = letter
+WIDTH, HEIGHT = letter
+HEADER_FORM = "relief_header"
 
-    # Header
+# Static styling ek hi baar banti hai, har report mein reuse hoti hai
+TABLE_COL_WIDTHS = [200, 100, 80, 150]
+TABLE_HEADER_ROW = ["Item Description", "Quantity", "Total Est.", "Nodal Source"]
+TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0,0), (-1,0), colors.darkgrey),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
+    ('GRID', (0,0), (-1,-1), 0.5, colors.black),
+    ('FONTSIZE', (0,0), (-1,-1), 8)
+])
+
+def _define_header(c):
+    # Header ek PDF form XObject hai: document mein ek baar likha jata hai,
+    # har page sirf usko reference karta hai
+    c.beginForm(HEADER_FORM)
     c.setFont("Helvetica-Bold", 18)
     c.setFillColor(colors.red)
-    c.drawString(50, height - 50, "GOVERNMENT OF INDIA - RELIEF BLUEPRINT")
-    
+    c.drawString(50, HEIGHT - 50, "GOVERNMENT OF INDIA - RELIEF BLUEPRINT")
+    c.setFillColor(colors.black)
+    c.line(50, HEIGHT - 80, WIDTH - 50, HEIGHT - 80)
+    c.endForm()
+
+def _draw_relief_page(c, data):
+    c.doForm(HEADER_FORM)
+
     c.setFont("Helvetica", 10)
     c.setFillColor(colors.black)
-    c.drawString(50, height - 70, f"Disaster: {data['disaster']} | Target Population: {data['estimated_impact']}")
-    c.line(50, height - 80, width - 50, height - 80)
+    subtitle = f"Disaster: {data['disaster']} | Target Population: {data['estimated_impact']}"
+    if data.get('district'):
+        subtitle = f"District: {data['district']} | " + subtitle
+    c.drawString(50, HEIGHT - 70, subtitle)
 
     # Table Header
-    table_data = [["Item Description", "Quantity", "Total Est.", "Nodal Source"]]
+    table_data = [TABLE_HEADER_ROW]
     for item in data['aid_items']:
         table_data.append([item['item'], item['quantity'], f"₹{item['total_cost']:,}", item['source']])
 
-    # Styling Table
-    relief_table = Table(table_data, colWidths=[200, 100, 80, 150])
-    style = TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.darkgrey),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
-        ('GRID', (0,0), (-1,-1), 0.5, colors.black),
-        ('FONTSIZE', (0,0), (-1,-1), 8)
-    ])
-    relief_table.setStyle(style)
-    relief_table.wrapOn(c, width, height)
-    relief_table.drawOn(c, 40, height - 400)
+    relief_table = Table(table_data, colWidths=TABLE_COL_WIDTHS)
+    relief_table.setStyle(TABLE_STYLE)
+    relief_table.wrapOn(c, WIDTH, HEIGHT)
+    relief_table.drawOn(c, 40, HEIGHT - 400)
 
     # Footer
     c.setFont("Helvetica-Bold", 12)
     c.drawString(50, 80, f"TOTAL BUDGET ESTIMATE: {data['total_budget']}")
     c.drawString(50, 60, f"EMERGENCY HELPLINE: {data['official_helpline']}")
-    
+
+@timed("relief.pdf_report")
+def create_relief_pdf_batch(plans) -> bytes:
+    """Render many relief plans (one page each) into a single PDF in one pass."""
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf, pagesize=letter)
+    _define_header(c)
+    for data in plans:
+        _draw_relief_page(c, data)
+        c.showPage()
     c.save()
-    return filename
\ No newline at end of file
+    return buf.getvalue()
+
+def create_relief_pdf(data) -> bytes:
+    return create_relief_pdf_batch([data])
@@ -0,0 +1,213 @@
+import math
+import os
+import threading
+from uuid import uuid4
+
+import cv2
+import numpy as np
+
+from app.core.config import settings
+from app.core.metrics import record_cache, upstream
+
+# Sentinel-2 before/after chips ke liye on-disk tile cache.
+# Chips uint8 RGBN arrays (H, W, 4) hain, key = source + XYZ tile + date window + size.
+# Cache hit pe file memory-mapped khulti hai, koi remote fetch nahi.
+
+S2_COLLECTION = "COPERNICUS/S2_SR_HARMONIZED"
+S2_BANDS = ["B4", "B3", "B2", "B8"]  # R, G, B, NIR
+S2_REFLECTANCE_MAX = 3000.0  # surface reflectance ko 0-255 mein stretch karne ke liye
+
+
+def tile_for_point(lat: float, lon: float, zoom: int):
+    n = 1 << zoom
+    lat = max(min(lat, 85.0511), -85.0511)
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return zoom, min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tile_bounds(z: int, x: int, y: int):
+    """(west, south, east, north) of an XYZ tile in degrees."""
+    n = 1 << z
+
+    def lat_at(row):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return x / n * 360.0 - 180.0, lat_at(y + 1), (x + 1) / n * 360.0 - 180.0, lat_at(y)
+
+
+class ImagerySource:
+    """Fetches a uint8 RGBN chip of shape (size, size, 4) for a tile and date window."""
+
+    name = "base"
+
+    def fetch_chip(self, tile, start: str, end: str, size: int) -> np.ndarray:
+        raise NotImplementedError
+
+
+class EarthEngineSource(ImagerySource):
+    name = "earth_engine"
+
+    def __init__(self, max_cloud=30):
+        self.max_cloud = max_cloud
+
+    def fetch_chip(self, tile, start, end, size):
+        import ee
+        from app.services.satellite.sentinel_client import init_earth_engine
+
+        init_earth_engine()
+        west, south, east, north = tile_bounds(*tile)
+        region = ee.Geometry.Rectangle([west, south, east, north])
+
+        collection = (ee.ImageCollection(S2_COLLECTION)
+                      .filterBounds(region)
+                      .filterDate(start, end)
+                      .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE', self.max_cloud)))
+        if collection.size().getInfo() == 0:
+            raise LookupError(f"No clear Sentinel-2 pass between {start} and {end}.")
+
+        # Median composite clouds aur gaps ko smooth kar deta hai
+        image = collection.median().select(S2_BANDS)
+        pixels = ee.data.computePixels({
+            "expression": image,
+            "fileFormat": "NUMPY_NDARRAY",
+            "grid": {
+                "dimensions": {"width": size, "height": size},
+                "affineTransform": {
+                    "scaleX": (east - west) / size, "shearX": 0, "translateX": west,
+                    "shearY": 0, "scaleY": -(north - south) / size, "translateY": north,
+                },
+                "crsCode": "EPSG:4326",
+            },
+        })
+        bands = np.stack([pixels[b] for b in S2_BANDS], axis=-1).astype(np.float32)
+        return np.clip(bands / S2_REFLECTANCE_MAX * 255.0, 0, 255).astype(np.uint8)
+
+
+class LocalFixtureSource(ImagerySource):
+    """Serves chips from a directory, for tests and offline demos.
+
+    Looks for `{z}_{x}_{y}_{start}_{end}.npy|.png` first, then `{start}_{end}.npy|.png`.
+    PNGs are read as RGB with the grey level standing in for NIR.
+    """
+
+    name = "local"
+
+    def __init__(self, root):
+        self.root = root
+        self.calls = 0
+
+    def _load(self, path):
+        if path.endswith(".npy"):
+            return np.load(path)
+        bgr = cv2.imread(path, cv2.IMREAD_COLOR)
+        nir = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+        return np.dstack([cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB), nir])
+
+    def fetch_chip(self, tile, start, end, size):
+        self.calls += 1
+        z, x, y = tile
+        for stem in (f"{z}_{x}_{y}_{start}_{end}", f"{start}_{end}"):
+            for ext in (".npy", ".png"):
+                path = os.path.join(self.root, stem + ext)
+                if os.path.exists(path):
+                    chip = self._load(path)
+                    if chip.shape[:2] != (size, size):
+                        chip = cv2.resize(chip, (size, size), interpolation=cv2.INTER_AREA)
+                    return chip.astype(np.uint8)
+        raise LookupError(f"No fixture chip for tile {tile} between {start} and {end}.")
+
+
+class TileCache:
+    def __init__(self, root, source: ImagerySource):
+        self.root = root
+        self.source = source
+        self.remote_fetches = 0
+        self._locks = {}  # path -> [lock, waiters], sirf in-flight fetches ke liye
+        self._locks_guard = threading.Lock()
+
+    def _path(self, tile, start, end, size):
+        z, x, y = tile
+        return os.path.join(self.root, self.source.name, str(z), str(x), str(y), f"{start}_{end}_{size}.npy")
+
+    def _acquire(self, path):
+        with self._locks_guard:
+            entry = self._locks.setdefault(path, [threading.Lock(), 0])
+            entry[1] += 1
+        entry[0].acquire()
+        return entry
+
+    def _release(self, path, entry):
+        entry[0].release()
+        with self._locks_guard:
+            entry[1] -= 1
+            # Aakhri waiter lock hata deta hai, map sirf in-flight paths rakhe
+            if entry[1] == 0:
+                del self._locks[path]
+
+    def get_chip(self, tile, start, end, size):
+        """Return (chip, cached) with the chip memory-mapped from disk."""
+        path = self._path(tile, start, end, size)
+        if os.path.exists(path):
+            record_cache("imagery_tile", True)
+            return np.load(path, mmap_mode="r"), True
+
+        # Same tile ke parallel requests sirf ek baar fetch karein
+        entry = self._acquire(path)
+        try:
+            if os.path.exists(path):
+                record_cache("imagery_tile", True)
+                return np.load(path, mmap_mode="r"), True
+
+            record_cache("imagery_tile", False)
+            with upstream(f"imagery.{self.source.name}"):
+                chip = self.source.fetch_chip(tile, start, end, size)
+            self.remote_fetches += 1
+
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{uuid4().hex}.tmp.npy"
+            np.save(tmp_path, np.ascontiguousarray(chip, dtype=np.uint8))
+            os.replace(tmp_path, path)
+        finally:
+            self._release(path, entry)
+        return np.load(path, mmap_mode="r"), False
+
+    def get_pair(self, lat, lon, before, after, zoom=None, size=None):
+        """Before/after chips for the tile containing (lat, lon).
+
+        `before` and `after` are (start, end) ISO date tuples.
+        """
+        zoom = settings.IMAGERY_TILE_ZOOM if zoom is None else zoom
+        size = settings.IMAGERY_CHIP_SIZE if size is None else size
+        tile = tile_for_point(lat, lon, zoom)
+        before_chip, before_cached = self.get_chip(tile, before[0], before[1], size)
+        after_chip, after_cached = self.get_chip(tile, after[0], after[1], size)
+        info = {
+            "tile": {"z": tile[0], "x": tile[1], "y": tile[2]},
+            "bounds": tile_bounds(*tile),
+            "source": self.source.name,
+            "before": {"start": before[0], "end": before[1], "cached": before_cached},
+            "after": {"start": after[0], "end": after[1], "cached": after_cached},
+        }
+        return before_chip, after_chip, info
+
+
+_tile_cache = None
+
+
+def _default_source():
+    if settings.IMAGERY_SOURCE == "local":
+        return LocalFixtureSource(settings.IMAGERY_FIXTURE_DIR)
+    return EarthEngineSource()
+
+
+def get_tile_cache() -> TileCache:
+    global _tile_cache
+    if _tile_cache is None:
+        _tile_cache = TileCache(settings.IMAGERY_CACHE_DIR, _default_source())
+    return _tile_cache
+
+
+def set_imagery_source(source: ImagerySource):
+    """Swap the imagery provider, e.g. a LocalFixtureSource in tests."""
+    get_tile_cache().source = source
@@ -2,18 +2,24 @@ import ee
 import os
 from datetime import datetime, timedelta
 from app.core.config import settings
+from app.core.metrics import timed, upstream
 
 EE_KEY_PATH = os.path.join(os.path.dirname(__file__), "../../core/gee-key.json")
 
-def check_satellite_area(lat: float, lon: float):
-    try:
-        # 1. Initialize GEE
+def init_earth_engine():
+    with upstream("earth_engine.init"):
         try:
             ee.Initialize(project=settings.GEE_PROJECT_ID)
         except Exception:
             credentials = ee.ServiceAccountCredentials(settings.SERVICE_ACCOUNT_EMAIL, EE_KEY_PATH)
             ee.Initialize(credentials, project=settings.GEE_PROJECT_ID)
 
+@timed("satellite.check_area")
+def check_satellite_area(lat: float, lon: float):
+    try:
+        # 1. Initialize GEE
+        init_earth_engine()
+
         # 2. Define search area
         point = ee.Geometry.Point([float(lon), float(lat)]).buffer(500).bounds()
 
@@ -30,7 +36,9 @@ def check_satellite_area(lat: float, lon: float):
 
         img = collection.first()
         
-        if not img.getInfo():
+        with upstream("earth_engine.scene"):
+            scene = img.getInfo()
+        if not scene:
             return {"status": "mismatch", "reason": "No clear satellite pass in the last 30 days."}
 
         # 4. NDWI Calculation (Water Detection)
@@ -38,11 +46,12 @@ def check_satellite_area(lat: float, lon: float):
         ndwi = img.normalizedDifference(['B3', 'B8']).rename('NDWI')
         
         # Get the mean NDWI value for the point
-        stats = ndwi.reduceRegion(
-            reducer=ee.Reducer.mean(),
-            geometry=point,
-            scale=10
-        ).getInfo()
+        with upstream("earth_engine.ndwi"):
+            stats = ndwi.reduceRegion(
+                reducer=ee.Reducer.mean(),
+                geometry=point,
+                scale=10
+            ).getInfo()
 
         water_value = stats.get('NDWI', 0)
 
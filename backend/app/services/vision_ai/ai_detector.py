@@ -1,4 +1,5 @@
 from transformers import pipeline
+from app.core.metrics import timed, observe_batch_size
 
 detector = pipeline(
     "image-classification",
@@ -6,7 +7,9 @@ detector = pipeline(
     device=-1
 )
 
+@timed("vision_ai.ai_detector")
 def detect_ai_generated(image_path: str):
+    observe_batch_size("ai_detector", 1)
     preds = detector(image_path)
 
     top = preds[0]
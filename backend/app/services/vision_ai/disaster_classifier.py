@@ -2,6 +2,7 @@ import torch
 from torchvision import models, transforms
 from PIL import Image
 from pathlib import Path
+from app.core.metrics import timed, observe_batch_size
 
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent
@@ -18,9 +19,11 @@ preprocess = transforms.Compose([
 
 IMAGENET_CLASSES =  LABELS_PATH.read_text().splitlines()
 
+@timed("vision_ai.disaster_classifier")
 def classify_disaster(image_path: str):
     img = Image.open(image_path).convert("RGB")
     tensor = preprocess(img).unsqueeze(0)
+    observe_batch_size("resnet50", tensor.shape[0])
 
     with torch.no_grad():
         outputs = model(tensor)
@@ -1,11 +1,14 @@
 from transformers import pipeline
+from app.core.metrics import timed, observe_batch_size
 
 _flood_model = pipeline(
     "image-classification",
     model="prithivMLmods/Flood-Image-Detection"
 )
 
+@timed("vision_ai.flood_detector")
 def detect_flood(image_path: str):
+    observe_batch_size("flood_detector", 1)
     result = _flood_model(image_path)[0]
 
     return {
@@ -1,6 +1,8 @@
 import requests
 from app.core.config import settings
+from app.core.metrics import timed
 
+@timed("vision_ai.reverse_search")
 def get_image_history(file_path: str):
     if not settings.ZENSERP_KEY:
         return {"is_old": False, "error": "API Key missing"}
@@ -0,0 +1,135 @@
+"""Local stand-ins for GDACS, USGS, Earth Engine and the vision models.
+
+Benchmarks must not depend on the network, so the upstream services are
+replaced with in-process fakes that return canned payloads after a fixed
+simulated latency.
+"""
+import sys
+import time
+import types
+from datetime import datetime, timedelta
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self._payload = payload
+        self.status_code = 200
+
+    def json(self):
+        return self._payload
+
+
+def gdacs_payload(count):
+    start = datetime(2025, 6, 1)
+    return {"features": [
+        {"properties": {
+            "eventname": f"India Flood {i}",
+            "country": "India" if i % 2 == 0 else "Bangladesh",
+            "fromdate": (start + timedelta(days=i % 120)).strftime("%Y-%m-%dT00:00:00"),
+        }}
+        for i in range(count)
+    ]}
+
+
+def usgs_payload(count):
+    start = datetime(2025, 1, 1).timestamp() * 1000
+    return {"features": [
+        {"properties": {
+            "mag": 3.5 + (i % 30) / 10,
+            "place": f"{i} km N of Test, India",
+            "time": start + i * 3_600_000,
+        }}
+        for i in range(count)
+    ]}
+
+
+class FakeUpstreams:
+    """Replacement for `requests.get` serving GDACS and USGS feeds locally."""
+
+    def __init__(self, features=500, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+        self._gdacs = gdacs_payload(features)
+        self._usgs = usgs_payload(features)
+
+    def get(self, url, timeout=None, **kwargs):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if "gdacs" in url:
+            return FakeResponse(self._gdacs)
+        if "usgs" in url:
+            return FakeResponse(self._usgs)
+        raise ValueError(f"Unexpected upstream URL in benchmark: {url}")
+
+
+class _Chain:
+    """Accepts any Earth Engine builder call and returns itself."""
+
+    def __init__(self, ee, info=None):
+        self._ee = ee
+        self._info = info
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def getInfo(self):
+        if self._ee.latency:
+            time.sleep(self._ee.latency)
+        return self._info
+
+
+class FakeEarthEngine(types.SimpleNamespace):
+    """Minimal `ee` module: enough surface for sentinel_client.check_satellite_area."""
+
+    def __init__(self, ndwi=0.12, latency=0.0):
+        super().__init__()
+        self.latency = latency
+        self.Geometry = types.SimpleNamespace(Point=lambda coords: _Chain(self))
+        self.Filter = types.SimpleNamespace(lt=lambda *a: None)
+        self.Reducer = types.SimpleNamespace(mean=lambda: None)
+        self._ndwi = ndwi
+
+    def Initialize(self, *args, **kwargs):
+        return None
+
+    def ServiceAccountCredentials(self, *args, **kwargs):
+        return None
+
+    def ImageCollection(self, name):
+        ee = self
+
+        class _Collection(_Chain):
+            def first(self):
+                return _Image(ee, {"id": "S2_FAKE"})
+
+        return _Collection(self)
+
+
+class _Image(_Chain):
+    def normalizedDifference(self, bands):
+        ee = self._ee
+
+        class _Band(_Chain):
+            def reduceRegion(self, **kwargs):
+                return _Chain(ee, {"NDWI": ee._ndwi})
+
+        return _Band(ee)
+
+
+def install_fake_models():
+    """Register fake vision modules so the routes import without downloading models."""
+
+    def detect_ai_generated(image_path):
+        return {"provider": "benchmark-fake", "label": "human", "confidence": 0.91, "raw": []}
+
+    def detect_flood(image_path):
+        return {"detected": True, "confidence": 0.88, "label": "flood"}
+
+    for name, fn in (
+        ("app.services.vision_ai.ai_detector", detect_ai_generated),
+        ("app.services.vision_ai.floods", detect_flood),
+    ):
+        module = types.ModuleType(name)
+        setattr(module, fn.__name__, fn)
+        sys.modules[name] = module
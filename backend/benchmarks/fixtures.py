@@ -0,0 +1,70 @@
+"""Deterministic synthetic fixture images for the benchmark suite."""
+import os
+
+import cv2
+import numpy as np
+from PIL import Image
+
+RESOLUTIONS = {
+    "sd": (640, 480),
+    "hd": (1920, 1080),
+    "4k": (3840, 2160),
+}
+
+
+def _terrain(width, height, rng):
+    # Smooth low-frequency "terrain" plus fine noise, JPEG ko realistic kaam milta hai
+    base = rng.integers(0, 255, size=(height // 16 + 1, width // 16 + 1, 3), dtype=np.uint8)
+    img = cv2.resize(base, (width, height), interpolation=cv2.INTER_CUBIC)
+    noise = rng.normal(0, 6, size=img.shape)
+    return np.clip(img + noise, 0, 255).astype(np.uint8)
+
+
+def _damage(img, rng):
+    # "After" image: kuch rectangles aur blobs jo structural change jaise dikhte hain
+    out = img.copy()
+    h, w = out.shape[:2]
+    for _ in range(12):
+        x, y = int(rng.integers(0, w - 40)), int(rng.integers(0, h - 40))
+        rw, rh = int(rng.integers(20, max(21, w // 6))), int(rng.integers(20, max(21, h // 6)))
+        color = tuple(int(c) for c in rng.integers(0, 255, size=3))
+        cv2.rectangle(out, (x, y), (x + rw, y + rh), color, -1)
+    return out
+
+
+def _exif_bytes():
+    exif = Image.Exif()
+    exif[0x010F] = "BenchCam"          # Make
+    exif[0x0110] = "Synthetic-1"       # Model
+    exif[0x0132] = "2025:07:15 10:30:00"  # DateTime
+    return exif.tobytes()
+
+
+def build_fixtures(root, names=None, seed=2025):
+    """Write before/after image pairs for each resolution and return their paths.
+
+    {"sd": {"before": ..., "after": ..., "jpeg": ..., "size": (w, h)}, ...}
+    """
+    os.makedirs(root, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    fixtures = {}
+    for name in names or RESOLUTIONS:
+        width, height = RESOLUTIONS[name]
+        before = _terrain(width, height, rng)
+        after = _damage(before, rng)
+
+        before_path = os.path.join(root, f"{name}_before.png")
+        after_path = os.path.join(root, f"{name}_after.png")
+        jpeg_path = os.path.join(root, f"{name}.jpg")
+        cv2.imwrite(before_path, before)
+        cv2.imwrite(after_path, after)
+        Image.fromarray(cv2.cvtColor(after, cv2.COLOR_BGR2RGB)).save(
+            jpeg_path, "JPEG", quality=92, exif=_exif_bytes())
+
+        fixtures[name] = {
+            "before": before_path,
+            "after": after_path,
+            "jpeg": jpeg_path,
+            "size": (width, height),
+        }
+    return fixtures
@@ -0,0 +1,329 @@
+"""Reproducible benchmark suite for the backend hot paths.
+
+Run from the backend directory:
+
+    python -m benchmarks.run --out bench.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json
+    python -m benchmarks.run --save-baseline benchmarks/baseline.json
+
+Upstream services (GDACS, USGS, Earth Engine) are always faked locally.
+Vision models run for real unless --fake-models is given (or they cannot
+be loaded), in which case model cases are reported as skipped.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks import fakes  # noqa: E402
+from benchmarks.fixtures import RESOLUTIONS, build_fixtures  # noqa: E402
+
+# Metrics jahan bada number behtar hai; baaki sab latency (chhota behtar)
+HIGHER_IS_BETTER = {"throughput_rps", "reports_per_sec", "pages_per_sec"}
+COMPARED_METRICS = ("median_ms", "throughput_rps", "reports_per_sec", "pages_per_sec")
+
+RELIEF_DISASTERS = ["Flood", "Earthquake", "Cyclone"]
+RELIEF_CONTEXTS = ["Rural", "Urban"]
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def _summary_ms(samples):
+    ms = [s * 1000 for s in samples]
+    return {
+        "median_ms": round(statistics.median(ms), 3),
+        "p95_ms": round(_percentile(ms, 95), 3),
+        "min_ms": round(min(ms), 3),
+        "runs": len(ms),
+    }
+
+
+def time_case(fn, repeat, warmup=1):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return _summary_ms(samples)
+
+
+def _with_rate(summary, metric, units=1):
+    # PDF cases ke liye reports/pages per second, median se
+    if summary["median_ms"]:
+        summary[metric] = round(units * 1000.0 / summary["median_ms"], 3)
+    return summary
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+
+def _install_fakes(args):
+    upstreams = fakes.FakeUpstreams(features=args.alert_features, latency=args.upstream_latency)
+    fake_ee = fakes.FakeEarthEngine(latency=args.upstream_latency)
+    # earthengine-api install na ho tab bhi sentinel_client import ho jaye
+    sys.modules.setdefault("ee", fake_ee)
+
+    from app.services.alerts import india_monitor
+    from app.services.satellite import sentinel_client
+    # Sirf india_monitor ka `requests` reference badlo, global requests module nahi
+    india_monitor.requests = types.SimpleNamespace(get=upstreams.get)
+    sentinel_client.ee = fake_ee
+    return upstreams
+
+
+def _load_models(args):
+    """Return (detect_ai_generated, classify_disaster) or None when models are unavailable."""
+    if args.fake_models:
+        fakes.install_fake_models()
+        return None
+    try:
+        from app.services.vision_ai.ai_detector import detect_ai_generated
+        from app.services.vision_ai.disaster_classifier import classify_disaster
+        return detect_ai_generated, classify_disaster
+    except Exception as e:
+        print(f"[bench] vision models unavailable ({e}); using fakes", file=sys.stderr)
+        fakes.install_fake_models()
+        return None
+
+
+def bench_units(args, fixtures, models):
+    from app.services.integrity.tamper_detector import detect_tampering
+    from app.services.integrity.duplicate_detector import compute_hash
+    from app.services.integrity.exif_checker import extract_exif
+    from app.services.analysis.processor import run_deep_analysis
+    from app.services.analysis.reporter import create_pdf_report
+    from app.services.alerts.india_monitor import get_comprehensive_india_alerts
+    from app.services.relief.aid_calculator import calculate_relief_needs
+    from app.services.relief.relief_reporter import create_relief_pdf, create_relief_pdf_batch
+    from app.services.satellite.sentinel_client import check_satellite_area
+
+    results = {}
+    for name, fx in fixtures.items():
+        results[f"detect_tampering[{name}]"] = time_case(lambda: detect_tampering(fx["jpeg"]), args.repeat)
+        results[f"compute_hash[{name}]"] = time_case(lambda: compute_hash(fx["jpeg"]), args.repeat)
+        results[f"extract_exif[{name}]"] = time_case(lambda: extract_exif(fx["jpeg"]), args.repeat)
+        results[f"run_deep_analysis[{name}]"] = time_case(
+            lambda: run_deep_analysis(fx["before"], fx["after"]), args.repeat)
+        if models:
+            detect_ai_generated, classify_disaster = models
+            results[f"ai_detector[{name}]"] = time_case(lambda: detect_ai_generated(fx["jpeg"]), args.repeat)
+            results[f"disaster_classifier[{name}]"] = time_case(
+                lambda: classify_disaster(fx["jpeg"]), args.repeat)
+        else:
+            results[f"ai_detector[{name}]"] = {"skipped": "models unavailable"}
+            results[f"disaster_classifier[{name}]"] = {"skipped": "models unavailable"}
+
+    results["alerts_aggregate"] = time_case(get_comprehensive_india_alerts, args.repeat)
+    results["satellite_check"] = time_case(lambda: check_satellite_area(26.14, 91.73), args.repeat)
+
+    # PDFs: damage report ek real heatmap overview ke saath
+    largest = list(fixtures.values())[-1]
+    damage = run_deep_analysis(largest["before"], largest["after"])
+    results["pdf_damage_report"] = _with_rate(
+        time_case(lambda: create_pdf_report(damage), args.repeat), "reports_per_sec")
+    plan = calculate_relief_needs("Flood", "Rural", 25000)
+    results["pdf_relief_report"] = _with_rate(
+        time_case(lambda: create_relief_pdf(plan), args.repeat), "reports_per_sec")
+    plans = []
+    for i in range(50):
+        district = calculate_relief_needs(RELIEF_DISASTERS[i % 3], RELIEF_CONTEXTS[i % 2], 1000 + 37 * i)
+        district["district"] = f"District-{i}"
+        plans.append(district)
+    results["pdf_relief_batch_50"] = _with_rate(
+        time_case(lambda: create_relief_pdf_batch(plans), args.repeat), "pages_per_sec", units=len(plans))
+    return results
+
+
+def configure_admission(args):
+    """Set the /media/verify gate explicitly so the e2e load is never shed with 503s."""
+    from app.core.admission import verify_gate
+
+    verify_gate.max_concurrency = args.verify_slots or verify_gate.max_concurrency
+    # Har concurrent client ke liye slot ya queue jagah
+    verify_gate.max_queue = max(verify_gate.max_queue, args.concurrency - verify_gate.max_concurrency)
+    verify_gate.max_wait = args.admission_wait
+    return {
+        "verify_max_concurrency": verify_gate.max_concurrency,
+        "verify_max_queue": verify_gate.max_queue,
+        "max_wait": verify_gate.max_wait,
+    }
+
+
+def bench_verify_endpoint(args, fixtures):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    fx = fixtures[args.e2e_resolution]
+    with open(fx["jpeg"], "rb") as f:
+        payload = f.read()
+
+    def one(i, client):
+        start = time.perf_counter()
+        res = client.post(
+            "/media/verify",
+            files={"file": (f"bench_{i}.jpg", payload, "image/jpeg")},
+            data={"lat": "26.14", "lon": "91.73"},
+        )
+        ok = res.status_code == 200 and res.json().get("status") == "success"
+        return time.perf_counter() - start, ok, res.status_code == 503
+
+    with TestClient(app) as client:
+        one(-1, client)  # warmup
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            outcomes = list(pool.map(lambda i: one(i, client), range(args.requests)))
+        elapsed = time.perf_counter() - start
+
+    latencies = [lat for lat, _, _ in outcomes]
+    summary = _summary_ms(latencies)
+    summary.update({
+        "throughput_rps": round(len(outcomes) / elapsed, 3),
+        "errors": sum(1 for _, ok, shed in outcomes if not ok and not shed),
+        "rejected": sum(1 for _, _, shed in outcomes if shed),
+        "concurrency": args.concurrency,
+        "resolution": args.e2e_resolution,
+    })
+    return {"media_verify_e2e": summary}
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of (case, metric, old, new) that regressed beyond tolerance."""
+    regressions = []
+    for case, old in baseline.get("results", {}).items():
+        new = results.get(case)
+        if not new or "skipped" in new or "skipped" in old:
+            continue
+        for metric in COMPARED_METRICS:
+            if metric not in old or metric not in new:
+                continue
+            if metric in HIGHER_IS_BETTER:
+                worse = new[metric] < old[metric] * (1 - tolerance)
+            else:
+                worse = new[metric] > old[metric] * (1 + tolerance)
+            if worse:
+                regressions.append((case, metric, old[metric], new[metric]))
+    return regressions
+
+
+def run_suite(args, names, workdir):
+    fixtures = build_fixtures(os.path.join(workdir, "fixtures"), names)
+
+    models = _load_models(args)
+    _install_fakes(args)
+
+    results = bench_units(args, fixtures, models)
+    admission = None
+    if not args.skip_e2e:
+        admission = configure_admission(args)
+        results.update(bench_verify_endpoint(args, fixtures))
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "fake_models": models is None,
+            "admission": admission,
+            "args": vars(args),
+        },
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the backend hot paths.")
+    parser.add_argument("--resolutions", default=",".join(RESOLUTIONS),
+                        help="comma separated subset of: " + ", ".join(RESOLUTIONS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--e2e-resolution", default="hd")
+    parser.add_argument("--verify-slots", type=int, default=None,
+                        help="admission slots for /media/verify (default: VERIFY_MAX_CONCURRENCY)")
+    parser.add_argument("--admission-wait", type=float, default=300.0,
+                        help="seconds a benchmark request may queue before a 503")
+    parser.add_argument("--alert-features", type=int, default=500)
+    parser.add_argument("--upstream-latency", type=float, default=0.0,
+                        help="simulated seconds per fake upstream call")
+    parser.add_argument("--fake-models", action="store_true")
+    parser.add_argument("--skip-e2e", action="store_true")
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--baseline", help="compare against this results JSON")
+    parser.add_argument("--save-baseline", help="also write results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="allowed relative slowdown before a case counts as a regression")
+    args = parser.parse_args(argv)
+
+    names = [n.strip() for n in args.resolutions.split(",") if n.strip()]
+    if args.e2e_resolution not in names:
+        names.append(args.e2e_resolution)
+
+    def resolve(path):
+        return path if os.path.isabs(path) else os.path.join(invoked_from, path)
+
+    # Services relative paths (heatmap store, ledger db, temp files) mein likhte hain,
+    # isliye sab ek temp workdir mein chalta hai jo end mein hat jata hai
+    invoked_from = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="pratyaksh-bench-") as workdir:
+        os.chdir(workdir)
+        try:
+            report = run_suite(args, names, workdir)
+        finally:
+            os.chdir(invoked_from)
+    results = report["results"]
+
+    for case, res in results.items():
+        if "skipped" in res:
+            print(f"{case:40s} skipped ({res['skipped']})")
+        elif "throughput_rps" in res:
+            print(f"{case:40s} {res['throughput_rps']:10.2f} req/s  p50 {res['median_ms']:.1f} ms"
+                  f"  p95 {res['p95_ms']:.1f} ms  errors {res['errors']}  rejected {res['rejected']}")
+        else:
+            rate = next((f"  {res[m]:.1f} {m}" for m in ("reports_per_sec", "pages_per_sec") if m in res), "")
+            print(f"{case:40s} {res['median_ms']:10.2f} ms  (p95 {res['p95_ms']:.2f}){rate}")
+
+    for path in (args.out, args.save_baseline):
+        if path:
+            with open(resolve(path), "w") as f:
+                json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(resolve(args.baseline)) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for case, metric, old, new in regressions:
+            print(f"REGRESSION {case} {metric}: {old} -> {new}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {int(args.tolerance * 100)}% against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
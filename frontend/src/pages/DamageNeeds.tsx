@@ -50,6 +50,7 @@ const DamageNeeds: React.FC = () => {
   const [population, setPopulation] = useState<number | ''>('');
   const [loading, setLoading] = useState<boolean>(false);
   const [backendResources, setBackendResources] = useState<Resource[]>([]);
+  const [reportLink, setReportLink] = useState<string | null>(null);
 
   const damageTypes: DamageType[] = [
     { id: 'flood', name: 'Flood', icon: <Droplets />, color: '#3b82f6', description: 'Water damage & contamination' },
@@ -96,6 +97,7 @@ const DamageNeeds: React.FC = () => {
       if (result.status === 'success') {
         const mapped = mapBackendItemsToResources(result.data.aid_items);
         setBackendResources(mapped);
+        setReportLink(result.report_link);
       }
     } catch (err) {
       console.error('Backend error:', err);
@@ -109,6 +111,7 @@ const DamageNeeds: React.FC = () => {
     setLocationContext('');
     setPopulation('');
     setBackendResources([]);
+    setReportLink(null);
     setPriorityFilter('All');
     setStep(1);
   };
@@ -120,13 +123,10 @@ const DamageNeeds: React.FC = () => {
     priorityFilter === 'All' ? true : r.priority === priorityFilter
   );
 
-  const downloadPDF = (type: 'damage' | 'relief') => {
-    const url =
-      type === 'damage'
-        ? 'http://127.0.0.1:8000/analysis/download-report'
-        : 'http://127.0.0.1:8000/analysis/download-relief-report';
-
-    window.open(url, '_blank');
+  // Each relief plan gets its own report link from the backend
+  const downloadPDF = () => {
+    if (!reportLink) return;
+    window.open(reportLink, '_blank');
   };
 
   return (
@@ -372,7 +372,8 @@ const DamageNeeds: React.FC = () => {
 
           <button
             className="action-btn secondary"
-            onClick={() => downloadPDF('relief')}
+            onClick={downloadPDF}
+            disabled={!reportLink}
           >
             <FileText size={18} /> Download Relief Plan
           </button>